@@ -0,0 +1,81 @@
+#***************************************************************************
+#*   Copyright (c) 2020 Carlo Pavan                                        *
+#*                                                                         *
+#*   This program is free software; you can redistribute it and/or modify  *
+#*   it under the terms of the GNU Lesser General Public License (LGPL)    *
+#*   as published by the Free Software Foundation; either version 2 of     *
+#*   the License, or (at your option) any later version.                   *
+#*   for detail see the LICENCE text file.                                 *
+#*                                                                         *
+#*   This program is distributed in the hope that it will be useful,       *
+#*   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+#*   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+#*   GNU Library General Public License for more details.                  *
+#*                                                                         *
+#*   You should have received a copy of the GNU Library General Public     *
+#*   License along with this program; if not, write to the Free Software   *
+#*   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+#*   USA                                                                   *
+#*                                                                         *
+#***************************************************************************
+"""Benchmark the opening voids of a facade with VoidSubtractAll.
+
+On a wall hosting 200 preset windows with default sills, it compares
+the envelope voids, computed from the preset parameters, with the former
+voids, fused with a copy of every window solid: time spent building the
+voids, time spent cutting the wall with them and wall face count.
+
+Run it from the repository root with:
+
+    FreeCADCmd benchmarks/benchmark_facade_voids.py
+"""
+
+import os
+import sys
+
+import FreeCAD as App
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from benchmark_utils import timed, make_facade
+
+
+FACADE_WINDOWS = 200
+
+
+def get_envelope_void(window):
+    """The current VoidSubtractAll void of preset openings."""
+    return window.Proxy.get_envelope_void(window)
+
+
+def get_fused_void(window):
+    """The former VoidSubtractAll void: the rectangular void fused with
+    a copy of every solid of the window.
+    """
+    void = window.Proxy.get_rectangular_void(window)
+    return void.fuse([s.copy() for s in window.Shape.Solids])
+
+
+def benchmark_facade_voids(count=FACADE_WINDOWS):
+    """Print the time spent building the voids of a facade of count
+    preset windows, as envelopes or fused with the window solids, and
+    cutting the wall with them.
+    """
+    print("\nFacade of {} windows with VoidSubtractAll".format(count))
+    print("{:>9} {:>10} {:>8} {:>11}".format("void", "voids (s)", "cut (s)", "wall faces"))
+    doc = App.newDocument("BenchmarkFacadeVoids")
+    try:
+        wall, windows, group_time = make_facade(doc, count, True)
+        doc.recompute()
+        base = wall.Proxy.get_default_shape(wall)
+        for name, get_void in (("envelope", get_envelope_void),
+                               ("fused", get_fused_void)):
+            voids, void_time = timed(lambda: [get_void(w) for w in windows])
+            shape, cut_time = timed(base.cut, voids)
+            print("{:>9} {:>10.3f} {:>8.3f} {:>11}".format(
+                  name, void_time, cut_time, len(shape.Faces)))
+    finally:
+        App.closeDocument(doc.Name)
+
+
+if __name__ == "__main__":
+    benchmark_facade_voids()
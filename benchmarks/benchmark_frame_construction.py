@@ -0,0 +1,88 @@
+#***************************************************************************
+#*   Copyright (c) 2020 Carlo Pavan                                        *
+#*                                                                         *
+#*   This program is free software; you can redistribute it and/or modify  *
+#*   it under the terms of the GNU Lesser General Public License (LGPL)    *
+#*   as published by the Free Software Foundation; either version 2 of     *
+#*   the License, or (at your option) any later version.                   *
+#*   for detail see the LICENCE text file.                                 *
+#*                                                                         *
+#*   This program is distributed in the hope that it will be useful,       *
+#*   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+#*   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+#*   GNU Library General Public License for more details.                  *
+#*                                                                         *
+#*   You should have received a copy of the GNU Library General Public     *
+#*   License along with this program; if not, write to the Free Software   *
+#*   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+#*   USA                                                                   *
+#*                                                                         *
+#***************************************************************************
+"""Benchmark the preset window frame constructions.
+
+For 1 to 9 panes, it compares frames built as 4 mitred members with
+frames built as single solids (FrameConstruction), in face and solid
+count, build time, tessellation time and BREP size, and in the time
+spent cutting a wall with a void fused with the window solids, as done
+with VoidSubtractAll on custom fills.
+
+Run it from the repository root with:
+
+    FreeCADCmd benchmarks/benchmark_frame_construction.py
+"""
+
+import os
+import sys
+
+from FreeCAD import Vector
+
+import freecad.archdesign.objects.preset_windows as preset_windows
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from benchmark_utils import timed, WALL_WIDTH, WINDOW_HEIGHT
+
+
+PANE_COUNTS = range(1, 10)
+# wide enough for 9 panes to leave 40% of the opening to the glass
+WINDOW_WIDTH = 3000.0
+
+
+def cut_wall(window):
+    """Cut a wall slab with a rectangular void fused with the window
+    solids. Return the cut wall.
+    """
+    import Part
+
+    wall = Part.makeBox(WINDOW_WIDTH + 2000, WALL_WIDTH, WINDOW_HEIGHT + 2000,
+                        Vector(-WINDOW_WIDTH / 2 - 1000, -WALL_WIDTH / 2, -1000))
+    void = Part.makeBox(WINDOW_WIDTH, WALL_WIDTH + 50, WINDOW_HEIGHT,
+                        Vector(-WINDOW_WIDTH / 2, -WALL_WIDTH / 2, 0))
+    void = void.fuse([s.copy() for s in window.Solids])
+    return wall.cut(void)
+
+
+def benchmark_frame_construction(pane_counts=PANE_COUNTS):
+    """Print face and solid count, build, tessellation and wall cut time
+    and BREP size of preset windows built with both frame constructions.
+    """
+    print("\nPreset window frame constructions")
+    print("{:>5} {:>13} {:>6} {:>6} {:>10} {:>15} {:>10} {:>9}".format(
+          "panes", "frames", "faces", "solids", "build (ms)", "tessellate (ms)",
+          "BREP (kB)", "cut (ms)"))
+    for panes in pane_counts:
+        for name, single_solid in (("Members", False), ("Single Solid", True)):
+            shape, build_time = timed(preset_windows.window_rectangular,
+                                      WALL_WIDTH, WINDOW_HEIGHT, WINDOW_WIDTH,
+                                      50, 50, 21, panes, single_solid)
+            if shape is None:
+                continue
+            result, tessellate_time = timed(shape.tessellate, 1.0)
+            result, cut_time = timed(cut_wall, shape)
+            print("{:>5} {:>13} {:>6} {:>6} {:>10.2f} {:>15.2f} {:>10.1f} {:>9.2f}".format(
+                  panes, name, len(shape.Faces), len(shape.Solids), build_time * 1000,
+                  tessellate_time * 1000, len(shape.exportBrepToString()) / 1024.0,
+                  cut_time * 1000))
+
+
+if __name__ == "__main__":
+    benchmark_frame_construction()
@@ -0,0 +1,124 @@
+#***************************************************************************
+#*   Copyright (c) 2020 Carlo Pavan                                        *
+#*                                                                         *
+#*   This program is free software; you can redistribute it and/or modify  *
+#*   it under the terms of the GNU Lesser General Public License (LGPL)    *
+#*   as published by the Free Software Foundation; either version 2 of     *
+#*   the License, or (at your option) any later version.                   *
+#*   for detail see the LICENCE text file.                                 *
+#*                                                                         *
+#*   This program is distributed in the hope that it will be useful,       *
+#*   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+#*   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+#*   GNU Library General Public License for more details.                  *
+#*                                                                         *
+#*   You should have received a copy of the GNU Library General Public     *
+#*   License along with this program; if not, write to the Free Software   *
+#*   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+#*   USA                                                                   *
+#*                                                                         *
+#***************************************************************************
+"""Benchmark the preset window frame and glass builders.
+
+It compares, for 1 to 9 panes, the former builders extruding filled
+faces (Part.makeFilledFace) with the current ones extruding planar faces
+and boxes, in build time, face count and tessellation time.
+
+Run it from the repository root with:
+
+    FreeCADCmd benchmarks/benchmark_preset_windows.py
+"""
+
+import os
+import sys
+
+from FreeCAD import Vector
+
+import freecad.archdesign.objects.preset_windows as preset_windows
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from benchmark_utils import timed, WALL_WIDTH, WINDOW_HEIGHT
+
+
+PANE_COUNTS = range(1, 10)
+# wide enough for 9 panes to leave 40% of the opening to the glass
+WINDOW_WIDTH = 3000.0
+
+
+def frame_rectangular_filled(tel_w, tel_h, tel_ww, tel_wh, tel_th, et=0):
+    """The former frame builder: 4 members extruded from filled faces."""
+    import Part
+
+    i_tel_w = tel_w - tel_ww * 2
+    i_tel_h = tel_h - tel_wh * 2
+
+    ep0 = (tel_w * -0.5, 0, 0)
+    ep1 = (tel_w * 0.5, 0, 0)
+    ep2 = (tel_w * 0.5, 0, tel_h)
+    ep3 = (tel_w * -0.5, 0, tel_h)
+
+    ip0 = (i_tel_w * -0.5, 0, tel_ww)
+    ip1 = (i_tel_w * 0.5, 0, tel_ww)
+    ip2 = (i_tel_w * 0.5, 0, tel_ww + i_tel_h)
+    ip3 = (i_tel_w * -0.5, 0, tel_ww + i_tel_h)
+
+    members = []
+    for member in ((ep0, ep1, ip1, ip0, ep0),
+                   (ep1, ep2, ip2, ip1, ep1),
+                   (ep2, ep3, ip3, ip2, ep2),
+                   (ep3, ep0, ip0, ip3, ep3)):
+        polygon = Part.makePolygon([Vector(*vtx) for vtx in member])
+        members.append(Part.makeFilledFace(polygon.Edges).extrude(Vector(0, tel_th, 0)))
+    return Part.makeCompound(members)
+
+
+def glass_filled(ea_w, ea_h, ef_w, ef_h, v_a, frame_th, glass_th):
+    """The former glass builder: a filled face extrusion."""
+    import Part
+
+    v_w = ea_w - ef_w + v_a * 2
+    v_h = ea_h - ef_h + v_a * 2
+
+    glass_pt = ((v_w * -0.5, 0, ef_w - v_a), (v_w * 0.5, 0, ef_w - v_a),
+                (v_w * 0.5, 0, ef_h - v_a + v_h), (v_w * -0.5, 0, ef_h - v_a + v_h))
+    polygon = Part.makePolygon([Vector(*vtx) for vtx in glass_pt + glass_pt[:1]])
+    return Part.makeFilledFace(polygon.Edges).extrude(Vector(0, glass_th, 0))
+
+
+def build_window(panes, filled_faces=False):
+    """Build a preset window with the given number of panes, with the
+    former filled face builders if filled_faces is True.
+    """
+    members = preset_windows.frame_rectangular_members
+    glass = preset_windows.glass
+    if filled_faces:
+        preset_windows.frame_rectangular_members = frame_rectangular_filled
+        preset_windows.glass = glass_filled
+    try:
+        return preset_windows.window_rectangular(
+            WALL_WIDTH, WINDOW_HEIGHT, WINDOW_WIDTH, 50, 50, 21, panes)
+    finally:
+        preset_windows.frame_rectangular_members = members
+        preset_windows.glass = glass
+
+
+def benchmark_preset_windows(pane_counts=PANE_COUNTS):
+    """Print build time, face count and tessellation time of preset
+    windows built with the former and the current builders.
+    """
+    print("\nPreset window builders")
+    print("{:>5} {:>13} {:>10} {:>6} {:>15}".format(
+          "panes", "builder", "build (ms)", "faces", "tessellate (ms)"))
+    for panes in pane_counts:
+        for name, filled_faces in (("Filled Faces", True), ("Planar Faces", False)):
+            shape, build_time = timed(build_window, panes, filled_faces)
+            if shape is None:
+                continue
+            result, tessellate_time = timed(shape.tessellate, 1.0)
+            print("{:>5} {:>13} {:>10.2f} {:>6} {:>15.2f}".format(
+                  panes, name, build_time * 1000, len(shape.Faces),
+                  tessellate_time * 1000))
+
+
+if __name__ == "__main__":
+    benchmark_preset_windows()
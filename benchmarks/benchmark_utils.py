@@ -0,0 +1,75 @@
+#***************************************************************************
+#*   Copyright (c) 2020 Carlo Pavan                                        *
+#*                                                                         *
+#*   This program is free software; you can redistribute it and/or modify  *
+#*   it under the terms of the GNU Lesser General Public License (LGPL)    *
+#*   as published by the Free Software Foundation; either version 2 of     *
+#*   the License, or (at your option) any later version.                   *
+#*   for detail see the LICENCE text file.                                 *
+#*                                                                         *
+#*   This program is distributed in the hope that it will be useful,       *
+#*   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+#*   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+#*   GNU Library General Public License for more details.                  *
+#*                                                                         *
+#*   You should have received a copy of the GNU Library General Public     *
+#*   License along with this program; if not, write to the Free Software   *
+#*   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+#*   USA                                                                   *
+#*                                                                         *
+#***************************************************************************
+"""Provide the helpers shared by the ArchDesign benchmark scripts.
+
+The benchmark scripts do not need the GUI and are not part of any test
+suite. Run them from the repository root with FreeCADCmd, e.g.:
+
+    FreeCADCmd benchmarks/benchmark_wall_openings.py
+"""
+
+import time
+
+import FreeCAD as App
+from FreeCAD import Vector
+
+from freecad.archdesign.objects.opening import Opening
+from freecad.archdesign.objects.wall import Wall
+
+
+WINDOW_WIDTH = 900.0
+WINDOW_HEIGHT = 1400.0
+WINDOW_SPACING = 1200.0
+WALL_WIDTH = 300.0
+WALL_HEIGHT = 3000.0
+
+
+def timed(function, *args):
+    """Return (result, seconds) of calling function(*args)."""
+    start = time.time()
+    result = function(*args)
+    return result, time.time() - start
+
+
+def make_facade(doc, count, void_subtract_all=False):
+    """Add to the given document a wall hosting count preset windows with
+    default sills, grouped into the wall with a single Group write.
+    Return the wall, the windows and the time spent adding them.
+    """
+    wall = doc.addObject('Part::FeaturePython', 'Wall', Wall(), None, True)
+    wall.AxisLastPointX = WINDOW_SPACING * (count + 1)
+    wall.Width = WALL_WIDTH
+    wall.Height = WALL_HEIGHT
+
+    windows = []
+    for i in range(count):
+        window = doc.addObject('Part::FeaturePython', 'Opening', Opening(), None, True)
+        window.OpeningWidth = WINDOW_WIDTH
+        window.OpeningHeight = WINDOW_HEIGHT
+        window.HostThickness = WALL_WIDTH
+        window.Fill = "Preset Window"
+        window.Addition = "Default Sill"
+        window.VoidSubtractAll = void_subtract_all
+        window.Placement.Base = Vector(WINDOW_SPACING * (i + 1), 0, 900)
+        windows.append(window)
+
+    result, elapsed = timed(wall.addObjects, windows)
+    return wall, windows, elapsed
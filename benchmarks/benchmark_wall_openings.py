@@ -0,0 +1,70 @@
+#***************************************************************************
+#*   Copyright (c) 2020 Carlo Pavan                                        *
+#*                                                                         *
+#*   This program is free software; you can redistribute it and/or modify  *
+#*   it under the terms of the GNU Lesser General Public License (LGPL)    *
+#*   as published by the Free Software Foundation; either version 2 of     *
+#*   the License, or (at your option) any later version.                   *
+#*   for detail see the LICENCE text file.                                 *
+#*                                                                         *
+#*   This program is distributed in the hope that it will be useful,       *
+#*   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+#*   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+#*   GNU Library General Public License for more details.                  *
+#*                                                                         *
+#*   You should have received a copy of the GNU Library General Public     *
+#*   License along with this program; if not, write to the Free Software   *
+#*   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+#*   USA                                                                   *
+#*                                                                         *
+#***************************************************************************
+"""Benchmark a wall hosting 10, 100 and 1,000 preset windows.
+
+It prints the time spent grouping the windows into the wall, recomputing
+the document and executing the wall alone, with the wall execute time
+per opening, which should stay about the same as the openings grow if
+the wall bookkeeping and cut scale near-linearly.
+
+Run it from the repository root with:
+
+    FreeCADCmd benchmarks/benchmark_wall_openings.py
+"""
+
+import os
+import sys
+
+import FreeCAD as App
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from benchmark_utils import timed, make_facade
+
+
+OPENING_COUNTS = (10, 100, 1000)
+
+
+def benchmark_wall_openings(counts=OPENING_COUNTS):
+    """Print the time spent grouping count windows into a wall, recomputing
+    the document and executing the wall alone, in total and per opening.
+    """
+    print("\nWall with hosted openings")
+    print("{:>8} {:>10} {:>14} {:>12} {:>22}".format(
+          "openings", "group (s)", "recompute (s)", "execute (s)", "execute/opening (ms)"))
+    for count in counts:
+        doc = App.newDocument("BenchmarkWallOpenings")
+        try:
+            wall, windows, group_time = make_facade(doc, count)
+            result, recompute_time = timed(doc.recompute)
+            wall.touch()
+            result, execute_time = timed(wall.recompute)
+            if len(wall.Openings) != count:
+                print("  warning: {} openings hosted instead of {}".format(
+                      len(wall.Openings), count))
+            print("{:>8} {:>10.3f} {:>14.3f} {:>12.3f} {:>22.3f}".format(
+                  count, group_time, recompute_time, execute_time,
+                  execute_time / count * 1000))
+        finally:
+            App.closeDocument(doc.Name)
+
+
+if __name__ == "__main__":
+    benchmark_wall_openings()
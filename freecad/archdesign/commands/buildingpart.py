@@ -348,6 +348,9 @@ class BuildingPart(ArchIFC.IfcProduct):
         if not "SavedInventor" in pl:
             obj.addProperty("App::PropertyFileIncluded","SavedInventor","BuildingPart",QT_TRANSLATE_NOOP("App::Property","This property stores an inventor representation for this object"))
             obj.setEditorMode("SavedInventor",2)
+        if not "ShapeMode" in pl:
+            obj.addProperty("App::PropertyEnumeration","ShapeMode","BuildingPart",QT_TRANSLATE_NOOP("App::Property","Faces builds the shape of this object from the faces of its children, Instances references the children shapes without extracting their faces"))
+            obj.ShapeMode = ["Faces","Instances"]
 
         self.Type = "BuildingPart"
 
@@ -377,6 +380,9 @@ class BuildingPart(ArchIFC.IfcProduct):
             self.svgcache = None
             self.shapecache = None
 
+        if prop == "ShapeMode":
+            self.compound_key = None
+
         if (prop == "Height" or prop == "HeightPropagate") and obj.Height.Value:
             self.touchChildren(obj)
 
@@ -412,18 +418,58 @@ class BuildingPart(ArchIFC.IfcProduct):
     def execute(self,obj):
 
         # gather all the child shapes into a compound
-        shapes = self.getShapes(obj)
-        if shapes:
-            f = []
-            for s in shapes:
-                f.extend(s.Faces)
-            #print("faces before compound:",len(f))
+        children = self.getShapeChildren(obj)
+        # the compound is rebuilt only if a child shape changed. The keyed
+        # shapes are kept, so their TShapes cannot be freed and reused by
+        # other shapes that would then compare the same
+        mode = getattr(obj,"ShapeMode","Faces")
+        shapes = [(child.Name,child.Shape) for child in children]
+        if children and not self.isCompoundCurrent(mode,shapes):
             import Part
-            obj.Shape = Part.makeCompound(f)
-            #print("faces after compound:",len(obj.Shape.Faces))
+            if mode == "Instances":
+                # the compound shares the children shapes as they are
+                obj.Shape = Part.makeCompound([shape for name,shape in shapes])
+            else:
+                # any change rebuilds the whole compound from the faces of
+                # all the children: only the face extraction of the
+                # unchanged children is skipped
+                f = []
+                for name,shape in shapes:
+                    f.extend(self.getFaces(name,shape))
+                # forget the children removed from this BuildingPart
+                self.facecache = dict((name,self.facecache[name]) for name,shape in shapes)
+                #print("faces before compound:",len(f))
+                obj.Shape = Part.makeCompound(f)
+                #print("faces after compound:",len(obj.Shape.Faces))
+            self.compound_key = (mode,shapes)
             #print("recomputing ",obj.Label)
         obj.Area = self.getArea(obj)
 
+    def isCompoundCurrent(self,mode,shapes):
+
+        "returns True if the compound was built with the given mode from the given (name, shape) children"
+
+        key = getattr(self,"compound_key",None)
+        if not key or key[0] != mode or len(key[1]) != len(shapes):
+            return False
+        for (name,shape),(cached_name,cached_shape) in zip(shapes,key[1]):
+            if name != cached_name or not shape.isSame(cached_shape):
+                return False
+        return True
+
+    def getFaces(self,name,shape):
+
+        "returns the faces of the given child shape, extracting them only if the shape changed"
+
+        if getattr(self,"facecache",None) is None:
+            self.facecache = {}
+        cached = self.facecache.get(name)
+        if cached and cached[0].isSame(shape):
+            return cached[1]
+        faces = shape.Faces
+        self.facecache[name] = (shape,faces)
+        return faces
+
     def getArea(self,obj):
 
         "computes the area of this floor by adding its inner spaces"
@@ -441,11 +487,17 @@ class BuildingPart(ArchIFC.IfcProduct):
 
         "recursively get the shapes of objects inside this BuildingPart"
 
-        shapes = []
+        return [child.Shape for child in self.getShapeChildren(obj)]
+
+    def getShapeChildren(self,obj):
+
+        "recursively get the objects with a shape inside this BuildingPart"
+
+        children = []
         for child in Draft.get_group_contents(obj):
-            if hasattr(child,'Shape'):
-                shapes.extend(child.Shape.Faces)
-        return shapes
+            if hasattr(child,'Shape') and not child.Shape.isNull():
+                children.append(child)
+        return children
 
     def getSpaces(self,obj):
 
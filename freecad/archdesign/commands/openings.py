@@ -39,6 +39,7 @@ from freecad.archdesign import ICONPATH
 import freecad.archdesign.functions.make_opening as make_opening
 import freecad.archdesign.functions.make_opening_template as make_opening_template
 import freecad.archdesign.functions.make_opening_type as make_opening_type
+import freecad.archdesign.functions.layout_openings as layout_openings
 
 from draftutils.translate import translate
 
@@ -64,6 +65,8 @@ class MakeOpeningBase(GuiCommandBase):
 
     def Activated(self):
         self.host = None
+        # hovered hosts data, cached by object name for the whole command
+        self.hosts_cache = {}
 
         sel = Gui.Selection.getSelection()
         if len(sel) == 1:
@@ -95,16 +98,18 @@ class MakeOpeningBase(GuiCommandBase):
         elif self.host is None:
             self.host = host
 
-        point = point.add(App.Vector(0, 0, self.sill_height))
-
         if host:
+            host_data = self.get_host_data(host.Name)
+            if host_data and host_data[1]:
+                # place the opening where the preview was snapped
+                point = self.project_on_axis(point, host_data[1])
             self.pl.Base = host.getGlobalPlacement().inverse().multVec(point)
             self.pl.Base.y = 0.0
             self.pl.Base.z = self.sill_height
             if hasattr(host, "Width"):
                 self.host_thickness = host.Width
         else:
-            self.pl.Base = point
+            self.pl.Base = point.add(App.Vector(0, 0, self.sill_height))
 
         self.finish()
 
@@ -116,16 +121,49 @@ class MakeOpeningBase(GuiCommandBase):
         delta = App.Vector(0, 0, self.opening_height/2 + self.sill_height)
         rot = App.Rotation()
         if info:
-            o = App.ActiveDocument.getObject(info['Object'])
-            if o and hasattr(o, "getGlobalPlacement"):
-                rot = o.getGlobalPlacement().Rotation
-                #if hasattr(o, "Proxy") and hasattr(o.Proxy, "get_core_axis"):
-                #    point.projectToLine(o.getGlobalPlacement().multVec(o.Proxy.get_first_point(o)), 
-                #                        o.getGlobalPlacement().multVec(o.Proxy.get_last_point(o)))
+            host_data = self.get_host_data(info['Object'])
+            if host_data:
+                rot, axis = host_data
+                if axis:
+                    # snap the cursor on the host core axis
+                    point = self.project_on_axis(point, axis)
         self.tracker.setRotation(rot)
         self.tracker.pos(point.add(delta))
 
 
+    def get_host_data(self, name):
+        """Return the global rotation and the global core axis end points of
+        the hovered host object, cached across the mouse events.
+        Return None if the hovered object cannot host an opening.
+        """
+        if name in self.hosts_cache:
+            return self.hosts_cache[name]
+        host_data = None
+        o = App.ActiveDocument.getObject(name)
+        if o and hasattr(o, "getGlobalPlacement"):
+            placement = o.getGlobalPlacement()
+            axis = None
+            if (hasattr(o, "Proxy") and hasattr(o.Proxy, "get_first_point")
+                    and hasattr(o.Proxy, "get_last_point")):
+                p1 = o.Proxy.get_first_point(o)
+                p2 = o.Proxy.get_last_point(o)
+                if p1 != p2:
+                    axis = (p1, p2.sub(p1))
+            host_data = (placement.Rotation, axis)
+        self.hosts_cache[name] = host_data
+        return host_data
+
+
+    def project_on_axis(self, point, axis):
+        """Return the projection of the given point on the given axis segment.
+        The axis is given as a (start point, direction vector) tuple.
+        """
+        start, direction = axis
+        t = point.sub(start).dot(direction) / direction.dot(direction)
+        t = min(max(t, 0.0), 1.0)
+        return start.add(App.Vector(direction).multiply(t))
+
+
     def taskbox(self):
         """Returns the opening taskbox widget. 
         Used by the snapper to append the widget to the task panel. 
@@ -258,6 +296,38 @@ class MakeDoor(MakeOpeningBase):
         App.ActiveDocument.recompute()
 
 
+class LayoutOpenings(GuiCommandBase):
+    """The Arch_Layout_Openings command definition.
+    Create windows along all the selected walls at a given spacing.
+    """
+
+    def GetResources(self):
+        return {'Pixmap'  : os.path.join(ICONPATH,"ArchDesign_Window.svg"),
+                'MenuText': "Layout Windows_EXPERIMENTAL",
+                'ToolTip': "EXPERIMENTAL\nCreates windows along the selected walls at a given spacing"}
+
+    def IsActive(self):
+        return not App.ActiveDocument is None
+
+    def Activated(self):
+        walls = [o for o in Gui.Selection.getSelection() if Draft.get_type(o) == "ArchDesign_Wall"]
+        if not walls:
+            print("select at least one wall")
+            return
+
+        spacing, ok = QtGui.QInputDialog.getDouble(None,
+                                                   translate("Arch", "Layout windows"),
+                                                   translate("Arch", "Windows spacing (mm)"),
+                                                   2000.0, 1.0, 1000000.0, 1)
+        if not ok:
+            return
+
+        App.ActiveDocument.openTransaction("Layout Windows")
+        layout_openings.layout_openings(walls, spacing=spacing, edge_offset=500.0)
+        App.ActiveDocument.commitTransaction()
+        App.ActiveDocument.recompute()
+
+
 # ---------------------------------------------------------------------------
 # Arch Door and Window Template creation commands
 # ---------------------------------------------------------------------------
@@ -0,0 +1,259 @@
+#***************************************************************************
+#*   Copyright (c) 2020 Carlo Pavan                                        *
+#*                                                                         *
+#*   This program is free software; you can redistribute it and/or modify  *
+#*   it under the terms of the GNU Lesser General Public License (LGPL)    *
+#*   as published by the Free Software Foundation; either version 2 of     *
+#*   the License, or (at your option) any later version.                   *
+#*   for detail see the LICENCE text file.                                 *
+#*                                                                         *
+#*   This program is distributed in the hope that it will be useful,       *
+#*   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+#*   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+#*   GNU Library General Public License for more details.                  *
+#*                                                                         *
+#*   You should have received a copy of the GNU Library General Public     *
+#*   License along with this program; if not, write to the Free Software   *
+#*   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+#*   USA                                                                   *
+#*                                                                         *
+#***************************************************************************
+"""Provide the functions to export all the Arch Views of a project at once.
+
+They do not need the GUI, so they can be run from FreeCADCmd, e.g.:
+
+    FreeCADCmd -c "from freecad.archdesign.functions import batch_export; \
+batch_export.export_file('project.FCStd', 'drawings')"
+"""
+## @package batch_export
+# \ingroup ARCH
+# \brief Provide the functions to export all the Arch Views of a project at once.
+
+import hashlib
+import json
+import os
+import re
+import time
+
+import FreeCAD as App
+import Draft
+
+import freecad.archdesign.functions.export_dxf as export_dxf
+import freecad.archdesign.functions.export_svg as export_svg
+import freecad.archdesign.functions.spatial_index as spatial_index
+from freecad.archdesign.functions.make_arch_view import make_arch_view
+from freecad.archdesign.objects.archview import ArchView, get_placement_key
+
+
+# Name of the file, written next to the exported drawings, that keeps the
+# content key of every exported file (see get_content_key).
+EXPORT_KEYS_FILE = ".archview_export.json"
+
+# Object properties the drawings depend on besides the object shape,
+# e.g. the door and window symbols of analytic plans.
+CONTENT_KEY_PROPERTIES = ("OpeningWidth", "OpeningHeight", "HostThickness",
+                          "Fill", "FillType", "FillAlignment", "FillDisplacement",
+                          "NumberOfPanes", "Void", "Width", "Height")
+
+
+def export_views(doc, directory, formats=("svg",), storey_plans=False,
+                 cut_height=1000.0, hidden=False):
+    """
+    export_views(doc, directory, [formats], [storey_plans], [cut_height], [hidden])
+
+    Export every ArchView of the given document to the given directory,
+    one file per view and format, named after the view label.
+
+    Sections and projections go through the views caches and, when
+    running headless, through the process pool (see parallel_section).
+    The content key of every written file is kept in EXPORT_KEYS_FILE,
+    in the given directory: a view whose content key did not change
+    since its files were written, even by another session, is neither
+    sectioned nor written again.
+    Files are written one after the other: writing them is mostly Python
+    code holding the GIL, and FreeCAD shapes are not meant to be shared
+    among threads.
+
+    Parameters
+    ----------
+    formats: tuple
+        "svg" and/or "dxf".
+
+    storey_plans: bool
+        If True, a plan view is also exported for every Building Storey,
+        cut at cut_height above the storey placement (see get_storey_plans).
+        Storey plan views missing from the document are created for the
+        export and removed afterwards.
+
+    Returns
+    -------
+    list
+        A report dictionary for every view, with the keys "View", "Time"
+        (seconds), "Hits" and "Misses" (reused and computed section and
+        projection pieces) and "Files" (written files).
+    """
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+
+    views = [o for o in doc.Objects if isinstance(getattr(o, "Proxy", None), ArchView)]
+    existing_names = set(o.Name for o in doc.Objects)
+    if storey_plans:
+        for view in get_storey_plans(doc, cut_height):
+            if not view in views:
+                views.append(view)
+
+    keys_path = os.path.join(directory, EXPORT_KEYS_FILE)
+    export_keys = {}
+    if os.path.exists(keys_path):
+        try:
+            with open(keys_path) as keys_file:
+                export_keys = json.load(keys_file)
+        except ValueError:
+            App.Console.PrintWarning("Ignoring invalid export keys file: " + keys_path + "\n")
+
+    report = []
+    object_keys = {}
+    for view in views:
+        start = time.time()
+        proxy = view.Proxy
+        content_key = get_content_key(view, hidden, object_keys)
+        name = re.sub(r"[^\w\-. ]", "_", view.Label)
+        paths = []
+        for extension in formats:
+            path = os.path.join(directory, name + "." + extension)
+            if export_keys.get(os.path.basename(path)) != content_key or not os.path.exists(path):
+                paths.append(path)
+
+        files = []
+        hits = misses = 0
+        if paths:
+            pieces = proxy.get_section_pieces(view)
+            projections = proxy.get_projection_pieces(view)
+            hits = proxy.section_stats[0] + proxy.projection_stats[0]
+            misses = proxy.section_stats[1] + proxy.projection_stats[1]
+        for path in paths:
+            extension = os.path.splitext(path)[1][1:]
+            if extension == "svg":
+                export_svg.export_svg(view, path, hidden=hidden,
+                                      pieces=pieces, projections=projections)
+            elif extension == "dxf":
+                export_dxf.export_dxf(view, path, hidden=hidden,
+                                      pieces=pieces, projections=projections)
+            else:
+                App.Console.PrintWarning("Unknown export format: " + extension + "\n")
+                continue
+            export_keys[os.path.basename(path)] = content_key
+            files.append(path)
+
+        elapsed = time.time() - start
+        report.append({"View": view.Label, "Time": elapsed,
+                       "Hits": hits, "Misses": misses, "Files": files})
+        App.Console.PrintMessage("{}: {:.3f} s, {} cached, {} computed, {} files written\n".format(
+                                 view.Label, elapsed, hits, misses, len(files)))
+
+    with open(keys_path, "w") as keys_file:
+        json.dump(export_keys, keys_file, indent=1, sort_keys=True)
+
+    for view in views:
+        if not view.Name in existing_names:
+            # storey plans created for this export only
+            doc.removeObject(view.Name)
+    return report
+
+
+def get_content_key(view, hidden=False, object_keys=None):
+    """
+    get_content_key(view, [hidden], [object_keys])
+
+    Return a hexadecimal digest of everything the drawings of the given
+    view depend on: the view settings and, for every object near the
+    section plane, its name, global placement, fill color, material
+    layers, CONTENT_KEY_PROPERTIES values and shape bound box, volume and
+    face count. No geometry is serialized. Unlike the in-memory cache
+    keys, it does not depend on the session, so it can be compared with
+    the key of files written before.
+
+    The key of every object is kept in the given object_keys dictionary,
+    if any, and reused by the following views of the same export.
+    """
+    if object_keys is None:
+        object_keys = {}
+    proxy = view.Proxy
+    if view.Objects:
+        objects = view.Objects
+    else:
+        objects = proxy.get_document_objects(view)
+
+    digest = hashlib.sha1()
+    settings = (get_placement_key(view.getGlobalPlacement()), hidden,
+                view.Depth.Value if hasattr(view, "Depth") else 0.0,
+                view.OnlySolids, view.UseMaterialColorForFill,
+                getattr(view, "AnalyticPlan", False))
+    digest.update(repr(settings).encode("utf-8"))
+    for o, shape, bb in proxy.get_section_candidates(view, objects):
+        key = object_keys.get(o.Name)
+        if key is None:
+            thicknesses = getattr(getattr(o, "Material", None), "Thicknesses", None)
+            properties = tuple(str(getattr(o, p, None)) for p in CONTENT_KEY_PROPERTIES)
+            key = repr((o.Name, get_placement_key(shape.Placement),
+                        spatial_index.get_bound_box_key(shape.BoundBox),
+                        round(shape.Volume, 3) if shape.Solids else 0.0,
+                        len(shape.Faces), thicknesses, properties))
+            object_keys[o.Name] = key
+        digest.update(key.encode("utf-8"))
+        digest.update(export_svg.get_fill_color(view, o).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def get_storey_plans(doc, cut_height=1000.0):
+    """
+    get_storey_plans(doc, [cut_height])
+
+    Return a plan ArchView for every Building Storey of the given document,
+    cut at cut_height above the storey placement and drawing the storey
+    contents with AnalyticPlan set.
+    Views are created the first time, labelled after the storey, and
+    updated afterwards. export_views removes the views created for an
+    export once they are exported, so the document is left as it was.
+    """
+    views = []
+    for storey in doc.Objects:
+        if getattr(storey, "IfcType", None) != "Building Storey":
+            continue
+        label = storey.Label + " Plan"
+        view = None
+        for o in doc.getObjectsByLabel(label):
+            if isinstance(getattr(o, "Proxy", None), ArchView):
+                view = o
+                break
+        if view is None:
+            view = make_arch_view(doc=doc)
+            view.Label = label
+            view.AnalyticPlan = True
+
+        placement = storey.getGlobalPlacement().multiply(
+            App.Placement(App.Vector(0, 0, cut_height), App.Rotation()))
+        if get_placement_key(view.Placement) != get_placement_key(placement):
+            view.Placement = placement
+        objects = [o for o in Draft.get_group_contents(storey)
+                   if hasattr(o, "Shape")]
+        if view.Objects != objects:
+            view.Objects = objects
+        views.append(view)
+    return views
+
+
+def export_file(path, directory, formats=("svg",), storey_plans=False,
+                cut_height=1000.0, hidden=False):
+    """
+    export_file(path, directory, [formats], [storey_plans], [cut_height], [hidden])
+
+    Open the given FCStd project, export its views (see export_views)
+    and close it without saving. Return the export report.
+    """
+    doc = App.openDocument(path)
+    try:
+        doc.recompute()
+        return export_views(doc, directory, formats, storey_plans, cut_height, hidden)
+    finally:
+        App.closeDocument(doc.Name)
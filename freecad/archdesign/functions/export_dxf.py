@@ -0,0 +1,84 @@
+#***************************************************************************
+#*   Copyright (c) 2020 Carlo Pavan                                        *
+#*                                                                         *
+#*   This program is free software; you can redistribute it and/or modify  *
+#*   it under the terms of the GNU Lesser General Public License (LGPL)    *
+#*   as published by the Free Software Foundation; either version 2 of     *
+#*   the License, or (at your option) any later version.                   *
+#*   for detail see the LICENCE text file.                                 *
+#*                                                                         *
+#*   This program is distributed in the hope that it will be useful,       *
+#*   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+#*   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+#*   GNU Library General Public License for more details.                  *
+#*                                                                         *
+#*   You should have received a copy of the GNU Library General Public     *
+#*   License along with this program; if not, write to the Free Software   *
+#*   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+#*   USA                                                                   *
+#*                                                                         *
+#***************************************************************************
+"""Provide the functions to export Arch Views to DXF files."""
+## @package export_dxf
+# \ingroup ARCH
+# \brief Provide the functions to export Arch Views to DXF files.
+
+import FreeCAD as App
+
+
+# Maximum distance between curved edges and their DXF lines, in mm.
+DEFLECTION = 1.0
+
+
+def export_dxf(view, path, hidden=False, pieces=None, projections=None):
+    """
+    export_dxf(view, path, [hidden], [pieces], [projections])
+
+    Write the cut of the given ArchView, and the projected lines of the
+    objects beyond it within the view Depth, to a DXF R12 file of LINE
+    entities, in the view coordinate system and in mm.
+    Cut lines are on the "Cut" layer, projected lines on the "Projection"
+    layer and, if hidden is True, hidden lines on the "Hidden" layer.
+
+    The file is written object by object, without building the whole
+    drawing in memory.
+
+    Parameters
+    ----------
+    pieces, projections: dict
+        The view section pieces and projections, if already computed
+        (see ArchView.get_section_pieces and get_projection_pieces).
+    """
+    proxy = view.Proxy
+    if pieces is None:
+        pieces = proxy.get_section_pieces(view)
+    if projections is None:
+        projections = proxy.get_projection_pieces(view)
+    inverse_placement = view.getGlobalPlacement().inverse()
+
+    with open(path, "w") as dxf:
+        dxf.write("0\nSECTION\n2\nENTITIES\n")
+        for key, (visible, hidden_edges), source in projections.values():
+            write_lines(dxf, visible, App.Placement(), "Projection")
+            if hidden:
+                write_lines(dxf, hidden_edges, App.Placement(), "Hidden")
+        for key, piece, source in pieces.values():
+            if not piece.isNull():
+                write_lines(dxf, piece, inverse_placement, "Cut")
+        dxf.write("0\nENDSEC\n0\nEOF\n")
+
+
+def write_lines(dxf, shape, inverse_placement, layer):
+    """Write the edges of the given shape to the given DXF file as LINE
+    entities, moved by the given inverse placement.
+    """
+    if not shape.Edges:
+        return
+    local_shape = shape.copy()
+    local_shape.Placement = inverse_placement.multiply(local_shape.Placement)
+    for edge in local_shape.Edges:
+        points = edge.discretize(Deflection=DEFLECTION)
+        for p1, p2 in zip(points[:-1], points[1:]):
+            dxf.write("0\nLINE\n8\n{}\n10\n{:.3f}\n20\n{:.3f}\n30\n0.0\n"
+                      "11\n{:.3f}\n21\n{:.3f}\n31\n0.0\n".format(
+                      layer, p1.x, p1.y, p2.x, p2.y))
@@ -0,0 +1,175 @@
+#***************************************************************************
+#*   Copyright (c) 2020 Carlo Pavan                                        *
+#*                                                                         *
+#*   This program is free software; you can redistribute it and/or modify  *
+#*   it under the terms of the GNU Lesser General Public License (LGPL)    *
+#*   as published by the Free Software Foundation; either version 2 of     *
+#*   the License, or (at your option) any later version.                   *
+#*   for detail see the LICENCE text file.                                 *
+#*                                                                         *
+#*   This program is distributed in the hope that it will be useful,       *
+#*   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+#*   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+#*   GNU Library General Public License for more details.                  *
+#*                                                                         *
+#*   You should have received a copy of the GNU Library General Public     *
+#*   License along with this program; if not, write to the Free Software   *
+#*   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+#*   USA                                                                   *
+#*                                                                         *
+#***************************************************************************
+"""Provide the functions to export Arch Views to SVG files."""
+## @package export_svg
+# \ingroup ARCH
+# \brief Provide the functions to export Arch Views to SVG files.
+
+import FreeCAD as App
+
+import freecad.archdesign.functions.spatial_index as spatial_index
+
+
+# Fill color of the cut areas when the material color is not used.
+DEFAULT_FILL = "#c8c8c8"
+# Maximum distance between curved edges and their SVG polylines, in mm.
+DEFLECTION = 1.0
+
+
+def export_svg(view, path, line_width=0.35, hidden=False, pieces=None, projections=None):
+    """
+    export_svg(view, path, [line_width], [hidden], [pieces], [projections])
+
+    Write the cut of the given ArchView, and the projected lines of the
+    objects beyond it within the view Depth, to an SVG file, in the view
+    coordinate system and in mm.
+
+    The drawing is written object by object, as <g> elements with the
+    object name as id. Every object fragment is kept in the view svgcache
+    and reused by the following exports until the object shape, the view
+    placement or the fill settings change. Fragments are kept with the
+    piece they were drawn from, since the cache keys of a recomputed
+    piece can match the previous ones.
+
+    Parameters
+    ----------
+    view: App::DocumentObject
+        The ArchView object to export.
+
+    path: string
+        The path of the SVG file to write.
+
+    line_width: float
+        The width of the cut lines. Projected lines are half as wide.
+
+    hidden: bool
+        If True, the hidden projected lines are drawn dashed.
+
+    pieces, projections: dict
+        The view section pieces and projections, if already computed
+        (see ArchView.get_section_pieces and get_projection_pieces).
+    """
+    proxy = view.Proxy
+    if pieces is None:
+        pieces = proxy.get_section_pieces(view)
+    if projections is None:
+        projections = proxy.get_projection_pieces(view)
+    if getattr(proxy, "svgcache", None) is None:
+        proxy.svgcache = {}
+
+    inverse_placement = view.getGlobalPlacement().inverse()
+    extent = App.BoundBox()
+    for key, piece, source in pieces.values():
+        if not piece.isNull():
+            extent.add(spatial_index.get_local_bound_box(piece.BoundBox, inverse_placement))
+    for key, (visible, hidden_edges), source in projections.values():
+        if visible.Edges:
+            extent.add(visible.BoundBox)
+    if not extent.isValid():
+        extent = App.BoundBox(0, 0, 0, 1, 1, 0)
+    extent.enlarge(line_width)
+
+    svgcache = {}
+    with open(path, "w") as svg:
+        svg.write('<?xml version="1.0" encoding="UTF-8" standalone="no"?>\n')
+        svg.write('<svg xmlns="http://www.w3.org/2000/svg" version="1.1" '
+                  'width="{0:.3f}mm" height="{1:.3f}mm" '
+                  'viewBox="{2:.3f} {3:.3f} {0:.3f} {1:.3f}">\n'.format(
+                  extent.XLength, extent.YLength, extent.XMin, -extent.YMax))
+        # projected lines first, so the cut is drawn over them
+        for name, (key, (visible, hidden_edges), source) in projections.items():
+            fragment_key = (key, line_width, hidden)
+            cached = proxy.svgcache.get(name + ":projection")
+            if cached and cached[0] == fragment_key and cached[2] is visible:
+                fragment = cached[1]
+            else:
+                fragment = get_svg_fragment(name + "-projection", visible,
+                                            App.Placement(), None, line_width / 2)
+                if hidden and hidden_edges.Edges:
+                    fragment += get_svg_fragment(name + "-hidden", hidden_edges,
+                                                 App.Placement(), None, line_width / 2,
+                                                 dash=line_width * 4)
+            svgcache[name + ":projection"] = (fragment_key, fragment, visible)
+            svg.write(fragment)
+        for name, (key, piece, source) in pieces.items():
+            if piece.isNull():
+                continue
+            fill = get_fill_color(view, view.Document.getObject(name))
+            fragment_key = (key, fill, line_width)
+            cached = proxy.svgcache.get(name)
+            if cached and cached[0] == fragment_key and cached[2] is piece:
+                fragment = cached[1]
+            else:
+                fragment = get_svg_fragment(name, piece, inverse_placement,
+                                            fill, line_width)
+            svgcache[name] = (fragment_key, fragment, piece)
+            svg.write(fragment)
+        svg.write('</svg>\n')
+    proxy.svgcache = svgcache
+
+
+def get_fill_color(view, obj):
+    """Return the SVG fill color of the cut areas of the given object."""
+    if view.UseMaterialColorForFill and obj and getattr(obj, "Material", None):
+        color = getattr(obj.Material, "Color", None)
+        if color:
+            return "#{:02x}{:02x}{:02x}".format(*[int(c * 255) for c in color[:3]])
+    return DEFAULT_FILL
+
+
+def get_svg_fragment(name, section, inverse_placement, fill, line_width, dash=None):
+    """Return the SVG <g> element drawing the edges of the given shape.
+    If a fill color is given, closed wires are filled with the even-odd
+    rule, so inner wires are drawn as holes, open wires are only stroked.
+    """
+    if not section.Edges:
+        return ""
+
+    import Part
+
+    local_section = section.copy()
+    local_section.Placement = inverse_placement.multiply(local_section.Placement)
+
+    closed = []
+    opened = []
+    for edges in Part.sortEdges(local_section.Edges):
+        wire = Part.Wire(edges)
+        points = wire.discretize(Deflection=DEFLECTION)
+        data = "M " + " L ".join("{:.3f} {:.3f}".format(p.x, -p.y) for p in points)
+        if fill and wire.isClosed():
+            closed.append(data + " Z")
+        else:
+            opened.append(data)
+
+    if dash:
+        fragment = ['<g id="{}" stroke-dasharray="{}">\n'.format(name, dash)]
+    else:
+        fragment = ['<g id="{}">\n'.format(name)]
+    if closed:
+        fragment.append('<path d="{}" fill="{}" fill-rule="evenodd" '
+                        'stroke="#000000" stroke-width="{}"/>\n'.format(
+                        " ".join(closed), fill, line_width))
+    if opened:
+        fragment.append('<path d="{}" fill="none" '
+                        'stroke="#000000" stroke-width="{}"/>\n'.format(
+                        " ".join(opened), line_width))
+    fragment.append('</g>\n')
+    return "".join(fragment)
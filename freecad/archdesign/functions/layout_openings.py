@@ -0,0 +1,138 @@
+#***************************************************************************
+#*   Copyright (c) 2020 Carlo Pavan                                        *
+#*                                                                         *
+#*   This program is free software; you can redistribute it and/or modify  *
+#*   it under the terms of the GNU Lesser General Public License (LGPL)    *
+#*   as published by the Free Software Foundation; either version 2 of     *
+#*   the License, or (at your option) any later version.                   *
+#*   for detail see the LICENCE text file.                                 *
+#*                                                                         *
+#*   This program is distributed in the hope that it will be useful,       *
+#*   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+#*   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+#*   GNU Library General Public License for more details.                  *
+#*                                                                         *
+#*   You should have received a copy of the GNU Library General Public     *
+#*   License along with this program; if not, write to the Free Software   *
+#*   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+#*   USA                                                                   *
+#*                                                                         *
+#***************************************************************************
+"""Provide the object code for Arch layout_openings function."""
+## @package layout_openings
+# \ingroup ARCH
+# \brief Provide the object code for Arch layout_openings function.
+
+import numpy as np
+
+import FreeCAD as App
+
+import freecad.archdesign.functions.make_opening as make_opening
+import freecad.archdesign.functions.make_opening_type as make_opening_type
+
+
+def get_layout_positions(start, end, width, spacing=None, count=None, edge_offset=0.0):
+    """
+    get_layout_positions(start, end, width, [spacing], [count], [edge_offset])
+
+    Return a numpy array with the X coordinates of the centers of the
+    openings laid out between start and end along the wall core axis.
+
+    Parameters
+    ----------
+    start, end: float
+        The X coordinates of the wall core axis end points.
+
+    width: float
+        The width of the openings.
+
+    spacing: float
+        Distance between the centers of two consecutive openings.
+        The openings are centered along the available length.
+
+    count: int
+        Number of openings evenly distributed along the available length.
+        It is used when spacing is None.
+
+    edge_offset: float
+        Minimum distance between the wall ends and the openings edges.
+    """
+    first = min(start, end) + edge_offset + width / 2
+    last = max(start, end) - edge_offset - width / 2
+    available = last - first
+    if available < 0:
+        return np.array([])
+
+    if spacing:
+        n = int(np.floor(available / spacing)) + 1
+        first += (available - (n - 1) * spacing) / 2
+        return first + np.arange(n) * spacing
+    elif count:
+        if count == 1:
+            return np.array([(first + last) / 2])
+        return np.linspace(first, last, count)
+    return np.array([])
+
+
+def layout_openings(walls, spacing=None, count=None, edge_offset=0.0,
+                    sill_height=1000.0, width=900.0, height=1400.0,
+                    fill="Window", opening_type=None):
+    """
+    layout_openings(walls, [spacing], [count], [edge_offset], [sill_height],
+                    [width], [height], [fill], [opening_type])
+
+    Create openings along the core axis of the given walls, according to
+    the given layout rule (see get_layout_positions).
+
+    The openings of each wall are added to it with a single group change,
+    so they are attached to the wall Openings list in bulk.
+    The function does not recompute the document.
+
+    Parameters
+    ----------
+    walls: list
+        The ArchDesign wall objects that will host the openings.
+
+    fill: string
+        "Window", "Door" or "None", to create openings filled with a
+        preset window, a preset door or empty openings.
+
+    opening_type: App::DocumentObject
+        Optional opening type to fill the openings with (see
+        make_opening_type.assign_type). It overrides fill.
+
+    Returns
+    -------
+    list
+        The created opening objects.
+    """
+    if fill == "Window":
+        make_function = make_opening.makeOpeningWindow
+    elif fill == "Door":
+        make_function = make_opening.makeOpeningDoor
+    else:
+        make_function = make_opening.makeOpening
+
+    created = []
+    for wall in walls:
+        if not hasattr(wall, "AxisFirstPointX") or not hasattr(wall, "Openings"):
+            App.Console.PrintWarning(wall.Label + " cannot host openings\n")
+            continue
+        positions = get_layout_positions(wall.AxisFirstPointX.Value,
+                                         wall.AxisLastPointX.Value,
+                                         width, spacing, count, edge_offset)
+        openings = []
+        for x in positions.tolist():
+            opening = make_function(width, height, wall.Width.Value, sill_height)
+            opening.Placement.Base = App.Vector(x, 0, sill_height)
+            openings.append(opening)
+        if not openings:
+            continue
+        # a single Group change: the wall adds all of them to its Openings
+        wall.addObjects(openings)
+        created.extend(openings)
+
+    if opening_type:
+        make_opening_type.assign_type(created, opening_type)
+
+    return created
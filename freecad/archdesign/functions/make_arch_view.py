@@ -32,20 +32,25 @@ if App.GuiUp:
     from archviewproviders.view_archview import ViewProviderArchView
 
 
-def make_arch_view(objectslist=None, name="View"):
+def make_arch_view(objectslist=None, name="View", doc=None):
     """TODO Properly document when finished
-    """
 
-    if not App.ActiveDocument:
+    The view is added to the given document, or to the active one.
+    """
+    if doc is None:
+        doc = App.ActiveDocument
+    if not doc:
         App.Console.PrintError("No active document. Aborting\n")
         return
 
-    # Add a Wall object to the docume
-    # TODO: verify if it's necessary to split this in 2 to have the 'if App.GuiUp:' 
-    # guard for the viewprovider
-    obj = App.ActiveDocument.addObject('Part::FeaturePython', 'ArchView', ArchView(), ViewProviderArchView(), True)   
+    # Add an ArchView object to the document, with its view provider
+    # only when the GUI is up (e.g. not when batch exporting)
+    view_provider = ViewProviderArchView() if App.GuiUp else None
+    obj = doc.addObject('Part::FeaturePython', 'ArchView', ArchView(), view_provider, True)
+    if objectslist:
+        obj.Objects = objectslist
 
-    App.ActiveDocument.recompute()
+    doc.recompute()
 
     return obj
 
@@ -35,7 +35,8 @@ def make_type_opening(ifc_type):
     Create an App::Part object to serve as Window or Door object definition and
     customize it adding the necessary properties and base geometries.
 
-    This object is meant to be istantiated by custom windows and doors types.
+    This object is meant to be istantiated by Opening objects through
+    App::Link (see assign_type), so its geometry is shared by all of them.
 
     The user may want to add more properties to the object, according to 
     specific needs.
@@ -53,8 +54,10 @@ def make_type_opening(ifc_type):
     opening_type = App.ActiveDocument.addObject('PartDesign::SubShapeBinder', 'Type'+ifc_type)
 
     # SubShapeBinder properties setup
+    # the type stays bound to its template instead of becoming a copy of
+    # it when edited, so it is the one definition shared by its openings
     if hasattr(opening_type, "BindCopyOnChange"):
-        opening_type.BindCopyOnChange = "Mutated"
+        opening_type.BindCopyOnChange = "Disabled"
     if hasattr(opening_type, "Relative"):
         opening_type.Relative = False
     if hasattr(opening_type, "PartialLoad"):
@@ -66,6 +69,38 @@ def make_type_opening(ifc_type):
     return opening_type
 
 
+def assign_type(openings, opening_type):
+    """
+    assign_type(openings, opening_type)
+
+    Fill the given Opening objects with the given opening type.
+
+    Every opening displays the type through an App::Link, so the type
+    geometry is stored once in the document and in the coin scene, and
+    changing the type of many openings only changes the linked object.
+
+    Parameters
+    ----------
+    openings: list
+        The Opening objects to fill with the opening type.
+
+    opening_type: App::DocumentObject
+        The opening type object, as returned by make_type_window
+        or make_type_door.
+    """
+    for opening in openings:
+        if not hasattr(opening, "OpeningType"):
+            if hasattr(getattr(opening, "Proxy", None), "set_type_properties"):
+                opening.Proxy.set_type_properties(opening)
+            else:
+                App.Console.PrintWarning(opening.Label + " cannot be filled with an opening type\n")
+                continue
+        if opening.Fill != "By Type":
+            opening.Fill = "By Type"
+        if opening.OpeningType != opening_type:
+            opening.OpeningType = opening_type
+
+
 def make_type_window(window_template=None, height=1350, width=800):
     """make_window_type
 
@@ -89,6 +124,8 @@ def make_type_window(window_template=None, height=1350, width=800):
     #window_type.IfcType = "Window"
     #IFCutils.setup_ifc_attributes(window_type)
 
+    return window_type
+
 
 def make_type_door(door_template=None, height=2100, width=800):
     """make_window_type
@@ -111,3 +148,5 @@ def make_type_door(door_template=None, height=2100, width=800):
     #IFCutils.set_ifc_properties(door_type, "IfcType") # IfcType not supported yet, treated as a IfcProduct
     #door_type.IfcType = "Window"
     #IFCutils.setup_ifc_attributes(door_type)
+
+    return door_type
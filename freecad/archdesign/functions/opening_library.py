@@ -0,0 +1,209 @@
+#***************************************************************************
+#*   Copyright (c) 2020 Carlo Pavan                                        *
+#*                                                                         *
+#*   This program is free software; you can redistribute it and/or modify  *
+#*   it under the terms of the GNU Lesser General Public License (LGPL)    *
+#*   as published by the Free Software Foundation; either version 2 of     *
+#*   the License, or (at your option) any later version.                   *
+#*   for detail see the LICENCE text file.                                 *
+#*                                                                         *
+#*   This program is distributed in the hope that it will be useful,       *
+#*   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+#*   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+#*   GNU Library General Public License for more details.                  *
+#*                                                                         *
+#*   You should have received a copy of the GNU Library General Public     *
+#*   License along with this program; if not, write to the Free Software   *
+#*   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+#*   USA                                                                   *
+#*                                                                         *
+#***************************************************************************
+"""Provide the functions to use opening types stored in external libraries.
+
+An opening library is a FCStd file containing opening types, as created by
+make_opening_type functions. Libraries are indexed reading only the
+Document.xml of the FCStd archive, and a type is imported into the project
+reading only its own shape file from the archive, so the library document
+is never opened and the other types geometry is never loaded.
+"""
+## @package opening_library
+# \ingroup ARCH
+# \brief Provide the functions to use opening types stored in external libraries.
+
+import os
+import tempfile
+import zipfile
+import xml.etree.ElementTree as ElementTree
+
+import FreeCAD as App
+
+import freecad.archdesign.functions.make_opening_type as make_opening_type
+
+
+# Library indexes already read, keyed on the library path.
+# Every item is a (modification time, index) tuple.
+_LIBRARY_INDEXES = {}
+
+
+def index_library(path):
+    """
+    index_library(path)
+
+    Return the list of the opening types stored in the given FCStd library,
+    reading only the library Document.xml, without loading the document.
+
+    Every opening type is a dictionary with the keys:
+    "Name", "Label", "IfcType", "Placement", "ShapeFile", "Path".
+    Types are SubShapeBinders (see make_type_opening), so they carry no
+    size property: "ShapeFile" is the name of the archive file storing
+    their shape, None if they have no shape.
+
+    Parameters
+    ----------
+    path: string
+        The path of the FCStd library file.
+    """
+    path = os.path.abspath(path)
+    mtime = os.path.getmtime(path)
+    cached = _LIBRARY_INDEXES.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    with zipfile.ZipFile(path) as archive:
+        with archive.open("Document.xml") as document_xml:
+            root = ElementTree.parse(document_xml).getroot()
+
+    index = []
+    object_data = root.find("ObjectData")
+    if object_data is not None:
+        for o in object_data.findall("Object"):
+            name = o.get("name")
+            if not name.startswith("Type"):
+                # opening types are named after make_type_opening
+                continue
+            properties = read_properties(o)
+            ifc_type = properties.get("IfcType") or name[len("Type"):].rstrip("0123456789")
+            index.append({"Name": name,
+                          "Label": properties.get("Label", name),
+                          "IfcType": ifc_type,
+                          "Placement": properties.get("Placement", App.Placement()),
+                          "ShapeFile": properties.get("Shape"),
+                          "Path": path})
+
+    _LIBRARY_INDEXES[path] = (mtime, index)
+    return index
+
+
+def read_properties(object_element):
+    """Return a dictionary with the string, float, placement and shape
+    file properties values of the given Document.xml Object element.
+    """
+    properties = {}
+    element = object_element.find("Properties")
+    if element is None:
+        return properties
+    for p in element.findall("Property"):
+        value = p.find("String")
+        if value is not None:
+            properties[p.get("name")] = value.get("value")
+            continue
+        value = p.find("Float")
+        if value is not None:
+            properties[p.get("name")] = float(value.get("value"))
+            continue
+        value = p.find("PropertyPlacement")
+        if value is not None:
+            base = App.Vector(*[float(value.get(k)) for k in ("Px", "Py", "Pz")])
+            rotation = App.Rotation(*[float(value.get(k)) for k in ("Q0", "Q1", "Q2", "Q3")])
+            properties[p.get("name")] = App.Placement(base, rotation)
+            continue
+        value = p.find("Part")
+        if value is not None and value.get("file"):
+            properties[p.get("name")] = value.get("file")
+    return properties
+
+
+def find_types(path, ifc_type=None, label=None):
+    """
+    find_types(path, [ifc_type], [label])
+
+    Return the indexed opening types of the given library matching the
+    given IfcType and containing the given text in their Label.
+    None values are not filtered.
+    """
+    found = []
+    for item in index_library(path):
+        if ifc_type is not None and item["IfcType"] != ifc_type:
+            continue
+        if label is not None and not label.lower() in item["Label"].lower():
+            continue
+        found.append(item)
+    return found
+
+
+def get_library_type(item, doc=None):
+    """
+    get_library_type(item, [doc])
+
+    Return the opening type object described by the given index item,
+    imported into the given document, or the active one.
+
+    Only the type shape file is read from the library archive: the type
+    is imported as a Part::Feature holding the type shape, labelled as
+    the type, and recording the library path and object name in its
+    LibraryPath and LibraryName properties. A type already imported into
+    the document is reused.
+    """
+    import Part
+
+    if doc is None:
+        doc = App.ActiveDocument
+    for o in doc.Objects:
+        if (getattr(o, "LibraryPath", None) == item["Path"]
+                and getattr(o, "LibraryName", None) == item["Name"]):
+            return o
+
+    if not item["ShapeFile"]:
+        return None
+    with zipfile.ZipFile(item["Path"]) as archive:
+        data = archive.read(item["ShapeFile"])
+    shape = Part.Shape()
+    if item["ShapeFile"].endswith(".brp"):
+        shape.importBrepFromString(data.decode("utf-8"))
+    else:
+        # binary shape files can only be read from disk
+        handle, shape_path = tempfile.mkstemp(suffix=".bin")
+        try:
+            with os.fdopen(handle, "wb") as shape_file:
+                shape_file.write(data)
+            shape.importBinary(shape_path)
+        finally:
+            os.remove(shape_path)
+    shape.Placement = item["Placement"]
+
+    opening_type = doc.addObject("Part::Feature", item["Name"])
+    opening_type.Label = item["Label"]
+    opening_type.Shape = shape
+    _tip = 'The opening library this type was imported from.'
+    opening_type.addProperty('App::PropertyFile', 'LibraryPath', 'Library', _tip).LibraryPath = item["Path"]
+    _tip = 'The name of this type in its opening library.'
+    opening_type.addProperty('App::PropertyString', 'LibraryName', 'Library', _tip).LibraryName = item["Name"]
+    return opening_type
+
+
+def instance_library_type(item, openings):
+    """
+    instance_library_type(item, openings)
+
+    Fill the given Opening objects with the opening type described by the
+    given index item, importing it from its library if needed.
+    """
+    if not openings:
+        return None
+    opening_type = get_library_type(item, openings[0].Document)
+    if opening_type is None:
+        App.Console.PrintError("Opening type " + item["Name"] + " not found in "
+                               + item["Path"] + "\n")
+        return None
+    make_opening_type.assign_type(openings, opening_type)
+    return opening_type
@@ -0,0 +1,148 @@
+#***************************************************************************
+#*   Copyright (c) 2020 Carlo Pavan                                        *
+#*                                                                         *
+#*   This program is free software; you can redistribute it and/or modify  *
+#*   it under the terms of the GNU Lesser General Public License (LGPL)    *
+#*   as published by the Free Software Foundation; either version 2 of     *
+#*   the License, or (at your option) any later version.                   *
+#*   for detail see the LICENCE text file.                                 *
+#*                                                                         *
+#*   This program is distributed in the hope that it will be useful,       *
+#*   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+#*   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+#*   GNU Library General Public License for more details.                  *
+#*                                                                         *
+#*   You should have received a copy of the GNU Library General Public     *
+#*   License along with this program; if not, write to the Free Software   *
+#*   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+#*   USA                                                                   *
+#*                                                                         *
+#***************************************************************************
+"""Provide the functions to compute sections and projections of many
+shapes in parallel.
+
+Shapes are sent to the worker processes serialized as BREP strings, and
+the resulting edges come back the same way, to be merged on the main
+process.
+"""
+## @package parallel_section
+# \ingroup ARCH
+# \brief Provide the functions to compute sections and projections of many shapes in parallel.
+
+import multiprocessing
+import os
+
+import FreeCAD as App
+
+
+# Below this number of shapes the serialization overhead is not worth a pool.
+PARALLEL_MIN_SHAPES = 16
+
+
+def get_section_processes():
+    """Return the number of worker processes to use for sections and
+    projections, as set in the "SectionProcesses" Arch preference.
+    0 means one process per core, 1 disables the process pool.
+    The pool is not used in the GUI, where the FreeCAD process cannot be
+    forked safely.
+    """
+    if App.GuiUp:
+        return 1
+    p = App.ParamGet("User parameter:BaseApp/Preferences/Mod/Arch")
+    processes = p.GetInt("SectionProcesses", 0)
+    if processes <= 0:
+        processes = os.cpu_count() or 1
+    return processes
+
+
+def section_brep(data):
+    """Worker function: return the BREP string of the section between the
+    two shapes given as a (shape BREP, plane BREP) tuple.
+    """
+    return read_brep(data[0]).section(read_brep(data[1])).exportBrepToString()
+
+
+def section_shapes(shapes, planes, processes=None):
+    """
+    section_shapes(shapes, planes, [processes])
+
+    Return the list of the sections between every given shape and the
+    corresponding plane.
+
+    When there are enough shapes and more than one process is available
+    (see get_section_processes), the sections are computed in a process
+    pool, otherwise they are computed here one after the other.
+    """
+    if processes is None:
+        processes = get_section_processes()
+    processes = min(processes, len(shapes))
+
+    if processes < 2 or len(shapes) < PARALLEL_MIN_SHAPES:
+        return [shape.section(plane) for shape, plane in zip(shapes, planes)]
+
+    data = [(shape.exportBrepToString(), plane.exportBrepToString())
+            for shape, plane in zip(shapes, planes)]
+    return [read_brep(brep) for brep in map_pool(section_brep, data, processes)]
+
+
+def project_shape(shape):
+    """Return the (visible edges, hidden edges) compounds of the hidden
+    line projection of the given shape along its +Z axis, on its XY plane.
+    """
+    import Part
+    import TechDraw
+
+    projection = TechDraw.projectEx(shape, App.Vector(0, 0, 1))
+    # projectEx returns hard, smooth, seam, outline and iso lines,
+    # first the visible ones then the hidden ones
+    visible = [e for s in (projection[0], projection[1], projection[3])
+               if not s.isNull() for e in s.Edges]
+    hidden = [e for s in (projection[5], projection[6], projection[8])
+              if not s.isNull() for e in s.Edges]
+    return Part.makeCompound(visible), Part.makeCompound(hidden)
+
+
+def project_brep(brep):
+    """Worker function: return the BREP strings of the visible and hidden
+    edges of the projection of the given shape BREP (see project_shape).
+    """
+    visible, hidden = project_shape(read_brep(brep))
+    return visible.exportBrepToString(), hidden.exportBrepToString()
+
+
+def project_shapes(shapes, processes=None):
+    """
+    project_shapes(shapes, [processes])
+
+    Return the list of the (visible edges, hidden edges) projections of
+    the given shapes (see project_shape), computed in a process pool
+    when possible, as section_shapes does.
+    """
+    if processes is None:
+        processes = get_section_processes()
+    processes = min(processes, len(shapes))
+
+    if processes < 2 or len(shapes) < PARALLEL_MIN_SHAPES:
+        return [project_shape(shape) for shape in shapes]
+
+    data = [shape.exportBrepToString() for shape in shapes]
+    return [(read_brep(visible), read_brep(hidden))
+            for visible, hidden in map_pool(project_brep, data, processes)]
+
+
+def map_pool(function, data, processes):
+    """Return the results of the given worker function applied to every
+    item of data, in a pool of forked processes.
+    """
+    with multiprocessing.get_context("fork").Pool(processes) as pool:
+        return pool.map(function, data,
+                        chunksize=max(1, len(data) // (processes * 4)))
+
+
+def read_brep(brep):
+    """Return the shape read from the given BREP string."""
+    import Part
+
+    shape = Part.Shape()
+    shape.importBrepFromString(brep)
+    return shape
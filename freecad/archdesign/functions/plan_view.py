@@ -0,0 +1,245 @@
+#***************************************************************************
+#*   Copyright (c) 2020 Carlo Pavan                                        *
+#*                                                                         *
+#*   This program is free software; you can redistribute it and/or modify  *
+#*   it under the terms of the GNU Lesser General Public License (LGPL)    *
+#*   as published by the Free Software Foundation; either version 2 of     *
+#*   the License, or (at your option) any later version.                   *
+#*   for detail see the LICENCE text file.                                 *
+#*                                                                         *
+#*   This program is distributed in the hope that it will be useful,       *
+#*   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+#*   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+#*   GNU Library General Public License for more details.                  *
+#*                                                                         *
+#*   You should have received a copy of the GNU Library General Public     *
+#*   License along with this program; if not, write to the Free Software   *
+#*   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+#*   USA                                                                   *
+#*                                                                         *
+#***************************************************************************
+"""Provide the functions to draw plan views of walls analytically.
+
+Walls built from their default shape are drawn from their parameters:
+the footprint of every material layer is a polygon computed from the wall
+axis, splays and offsets, openings crossing the cut height become gaps in
+it, and door and window symbols are drawn from the Opening parameters.
+No OCC boolean or section operation is needed.
+"""
+## @package plan_view
+# \ingroup ARCH
+# \brief Provide the functions to draw plan views of walls analytically.
+
+import math
+
+import FreeCAD as App
+
+import draftutils.utils as utils
+
+from freecad.archdesign.objects.opening import DOOR_LEAF_THICKNESS
+
+
+def get_wall_plan_shape(wall, view_placement):
+    """
+    get_wall_plan_shape(wall, view_placement)
+
+    Return a compound of the plan of the given wall cut by the horizontal
+    plane of the given view placement: the closed wires of its layers
+    footprints, interrupted by the openings, and the opening symbols.
+
+    Return None if the wall cannot be drawn analytically (walls based on
+    BaseGeometry or with Additions or Subtractions, planes not parallel to
+    the wall base) so it has to be sectioned.
+    Return a null shape if the plane does not cut the wall.
+    """
+    import Part
+
+    if getattr(getattr(wall, "Proxy", None), "Type", None) != "ArchDesign_Wall":
+        return None
+    if wall.BaseGeometry or wall.Additions or wall.Subtractions:
+        return None
+
+    wall_placement = wall.getGlobalPlacement()
+    relative_placement = wall_placement.inverse().multiply(view_placement)
+    normal = relative_placement.Rotation.multVec(App.Vector(0, 0, 1))
+    if abs(normal.z) < 1 - 1e-9:
+        return None
+    cut_height = relative_placement.Base.z
+    if cut_height < 0 or cut_height > wall.Height.Value:
+        return Part.Shape()
+
+    polygons = get_wall_footprint(wall)
+    if polygons is None:
+        return None
+
+    gaps = []
+    symbols = []
+    for o in wall.Openings:
+        opening = get_opening_plan(wall, o, cut_height)
+        if opening is None:
+            # the opening void is not known: section the wall
+            return None
+        if opening:
+            gaps.append(opening[0])
+            symbols.extend(opening[1])
+
+    pieces = polygons
+    for x_min, x_max in gaps:
+        clipped = []
+        for polygon in pieces:
+            clipped.append(clip_polygon(polygon, x_max, 1))
+            clipped.append(clip_polygon(polygon, x_min, -1))
+        pieces = [p for p in clipped if len(p) > 2]
+
+    shapes = [Part.makePolygon([App.Vector(x, y, cut_height) for x, y in p + p[:1]])
+              for p in pieces]
+    for symbol in symbols:
+        symbol.translate(App.Vector(0, 0, cut_height))
+        shapes.append(symbol)
+    if not shapes:
+        return Part.Shape()
+    shape = Part.makeCompound(shapes)
+    shape.Placement = wall_placement
+    return shape
+
+
+def get_opening_host(opening):
+    """Return the wall hosting the given opening in its Openings list,
+    or None.
+    """
+    if not hasattr(opening, "OpeningWidth"):
+        return None
+    for o in opening.InList:
+        if getattr(getattr(o, "Proxy", None), "Type", None) == "ArchDesign_Wall":
+            if opening.Name in [w.Name for w in o.Openings]:
+                return o
+    return None
+
+
+def get_wall_footprint(wall):
+    """
+    get_wall_footprint(wall)
+
+    Return the footprints of the wall material layers, as lists of (x, y)
+    points in the wall coordinate system, from the wall default shape
+    parameters (see Wall.get_default_shape_parameters).
+    Layers are ordered from Y=-thickness/2, as in a MultiMaterial.
+    """
+    parameters = wall.Proxy.get_default_shape_parameters(wall)
+    if parameters is None:
+        return None
+    first_point, thickness, inner_params, outer_params = parameters
+    first_point = float(first_point)
+    thickness = float(thickness)
+
+    # (Y of the wedge side lying on its own Y=0, left X, right X on that
+    #  side, left X, right X on the side lying on its own Y=thickness/2)
+    halves = []
+    for y0, params in ((-thickness/2, outer_params), (0.0, inner_params)):
+        Xmin, X2min, Xmax, X2max = [first_point + float(v) for v in params]
+        halves.append((y0, Xmin, Xmax, X2min, X2max))
+
+    bands = []
+    if wall.Material and utils.get_type(wall.Material) == 'MultiMaterial':
+        y = -thickness/2
+        for lt in wall.Material.Thicknesses:
+            bands.append((y, y + lt))
+            y += lt
+    else:
+        bands.append((-thickness/2, thickness/2))
+
+    polygons = []
+    for y_start, y_end in bands:
+        right = []
+        left = []
+        for y0, x_min, x_max, x2_min, x2_max in halves:
+            a = max(y_start, y0)
+            b = min(y_end, y0 + thickness/2)
+            if b <= a:
+                continue
+            for y in (a, b):
+                t = (y - y0) / (thickness/2)
+                right.append((x_max + (x2_max - x_max) * t, y))
+                left.append((x_min + (x2_min - x_min) * t, y))
+        polygon = []
+        for point in right + left[::-1]:
+            if not polygon or polygon[-1] != point:
+                polygon.append(point)
+        if len(polygon) > 2 and polygon[0] == polygon[-1]:
+            polygon.pop()
+        if len(polygon) > 2:
+            polygons.append(polygon)
+    return polygons
+
+
+def get_opening_plan(wall, opening, cut_height):
+    """
+    get_opening_plan(wall, opening, cut_height)
+
+    Return a ((x_min, x_max), symbols) tuple with the gap left by the given
+    opening in the wall plan and the shapes of its door or window symbol,
+    in the wall coordinate system at Z=0.
+    Return an empty tuple if the opening does not cross the cut height,
+    None if its void is not a plain rectangle across the wall.
+    """
+    import Part
+
+    if not hasattr(opening, "OpeningWidth") or opening.Void != "Rectangular":
+        return None
+    if opening.Name in [o.Name for o in wall.Group]:
+        placement = opening.Placement
+    else:
+        placement = wall.getGlobalPlacement().inverse().multiply(opening.getGlobalPlacement())
+    if placement.Rotation.Angle > 1e-9:
+        return None
+
+    sill = placement.Base.z
+    if cut_height < sill or cut_height > sill + opening.OpeningHeight.Value:
+        return ()
+
+    width = opening.OpeningWidth.Value
+    x_min = placement.Base.x - width/2
+    x_max = placement.Base.x + width/2
+    fill_y = opening.Proxy.get_fill_y(opening) + placement.Base.y
+
+    symbols = []
+    if opening.Fill == "Preset Window":
+        frame_th = opening.FrameThickness.Value
+        for y in (fill_y, fill_y + frame_th / 2, fill_y + frame_th):
+            symbols.append(Part.makeLine(App.Vector(x_min, y, 0), App.Vector(x_max, y, 0)))
+    elif opening.Fill == "Preset Door":
+        # leaf drawn open at 90 degrees, hinged on the x_min jamb
+        hinge = App.Vector(x_min, fill_y + DOOR_LEAF_THICKNESS, 0)
+        leaf = [hinge, hinge + App.Vector(DOOR_LEAF_THICKNESS, 0, 0),
+                hinge + App.Vector(DOOR_LEAF_THICKNESS, width, 0),
+                hinge + App.Vector(0, width, 0), hinge]
+        symbols.append(Part.makePolygon(leaf))
+        swing = Part.Circle(hinge, App.Vector(0, 0, 1), width)
+        symbols.append(Part.ArcOfCircle(swing, 0, math.pi/2).toShape())
+    return (x_min, x_max), symbols
+
+
+def clip_polygon(polygon, x, side):
+    """Return the part of the given polygon where (X - x) * side >= 0,
+    clipping it against the vertical line at the given X
+    (Sutherland-Hodgman algorithm).
+    """
+    def inside(point):
+        return (point[0] - x) * side >= 0
+
+    clipped = []
+    for i, current in enumerate(polygon):
+        previous = polygon[i - 1]
+        if inside(current):
+            if not inside(previous):
+                clipped.append(intersect(previous, current, x))
+            clipped.append(current)
+        elif inside(previous):
+            clipped.append(intersect(previous, current, x))
+    return clipped
+
+
+def intersect(p1, p2, x):
+    """Return the point of the segment p1 p2 lying at the given X."""
+    t = (x - p1[0]) / (p2[0] - p1[0])
+    return (x, p1[1] + (p2[1] - p1[1]) * t)
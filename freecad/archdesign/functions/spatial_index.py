@@ -0,0 +1,289 @@
+#***************************************************************************
+#*   Copyright (c) 2020 Carlo Pavan                                        *
+#*                                                                         *
+#*   This program is free software; you can redistribute it and/or modify  *
+#*   it under the terms of the GNU Lesser General Public License (LGPL)    *
+#*   as published by the Free Software Foundation; either version 2 of     *
+#*   the License, or (at your option) any later version.                   *
+#*   for detail see the LICENCE text file.                                 *
+#*                                                                         *
+#*   This program is distributed in the hope that it will be useful,       *
+#*   but WITHOUT ANY WARRANTY; without even the implied warranty of        *
+#*   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the         *
+#*   GNU Library General Public License for more details.                  *
+#*                                                                         *
+#*   You should have received a copy of the GNU Library General Public     *
+#*   License along with this program; if not, write to the Free Software   *
+#*   Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  *
+#*   USA                                                                   *
+#*                                                                         *
+#***************************************************************************
+"""Provide a spatial index of the document objects shapes.
+
+The index is a uniform grid of axis aligned cells, each one listing the
+objects whose bound box overlaps it. Every document gets its own index,
+built on first use and then kept up to date by a document observer when
+objects shapes or placements change, so queries (sections, clash
+detection, picking, snapping) only test the objects near the query region.
+"""
+## @package spatial_index
+# \ingroup ARCH
+# \brief Provide a spatial index of the document objects shapes.
+
+import math
+
+import FreeCAD as App
+
+
+# Size of the grid cells in mm.
+CELL_SIZE = 5000.0
+# Objects overlapping more cells than this are kept in a separate list
+# and tested by every query.
+MAX_OBJECT_CELLS = 4096
+
+# Spatial indexes keyed on the document name.
+_INDEXES = {}
+_OBSERVER = None
+
+
+class SpatialIndex(object):
+    """A uniform grid index of the bound boxes of the document objects
+    with a shape.
+    """
+    def __init__(self, cell_size=CELL_SIZE):
+        self.cell_size = cell_size
+        self.items = {}   # object name: (bound box, cells)
+        self.cells = {}   # cell: set of object names
+        # for every axis, cell index along it: set of object names
+        self.layers = ({}, {}, {})
+        self.large = set()
+
+
+    def build(self, doc):
+        """Index all the objects of the given document."""
+        self.items = {}
+        self.cells = {}
+        self.layers = ({}, {}, {})
+        self.large = set()
+        for o in doc.Objects:
+            self.update(o)
+
+
+    def get_cells(self, bound_box):
+        """Return the range of cells overlapped by the given bound box,
+        as a (first cell, last cell) tuple.
+        """
+        cs = self.cell_size
+        first = (int(math.floor(bound_box.XMin / cs)),
+                 int(math.floor(bound_box.YMin / cs)),
+                 int(math.floor(bound_box.ZMin / cs)))
+        last = (int(math.floor(bound_box.XMax / cs)),
+                int(math.floor(bound_box.YMax / cs)),
+                int(math.floor(bound_box.ZMax / cs)))
+        return first, last
+
+
+    def get_cell_bound_box(self, cell):
+        cs = self.cell_size
+        return App.BoundBox(cell[0] * cs, cell[1] * cs, cell[2] * cs,
+                            (cell[0] + 1) * cs, (cell[1] + 1) * cs, (cell[2] + 1) * cs)
+
+
+    def update(self, obj):
+        """Add the given object to the index, or move it to its current
+        cells if its bound box changed.
+        """
+        if not hasattr(obj, "Shape") or obj.TypeId == "App::Link":
+            self.remove(obj.Name)
+            return
+        shape = get_global_shape(obj)
+        if shape.isNull() or not shape.BoundBox.isValid():
+            self.remove(obj.Name)
+            return
+        bound_box = shape.BoundBox
+        item = self.items.get(obj.Name)
+        if item and get_bound_box_key(item[0]) == get_bound_box_key(bound_box):
+            return
+        self.remove(obj.Name)
+
+        first, last = self.get_cells(bound_box)
+        count = 1
+        for i in range(3):
+            count *= last[i] - first[i] + 1
+        if count > MAX_OBJECT_CELLS:
+            self.large.add(obj.Name)
+            self.items[obj.Name] = (bound_box, ())
+            return
+        cells = [(i, j, k) for i in range(first[0], last[0] + 1)
+                           for j in range(first[1], last[1] + 1)
+                           for k in range(first[2], last[2] + 1)]
+        for cell in cells:
+            self.cells.setdefault(cell, set()).add(obj.Name)
+        for axis in range(3):
+            for index in range(first[axis], last[axis] + 1):
+                self.layers[axis].setdefault(index, set()).add(obj.Name)
+        self.items[obj.Name] = (bound_box, cells)
+
+
+    def update_children(self, obj):
+        """Update the objects grouped into the given GeoFeatureGroup,
+        recursively, since their global position follows the group one.
+        """
+        if not hasattr(obj, "Group") or not obj.hasExtension("App::GeoFeatureGroupExtension"):
+            return
+        for child in obj.Group:
+            self.update(child)
+            self.update_children(child)
+
+
+    def remove(self, name):
+        """Remove the object with the given name from the index."""
+        item = self.items.pop(name, None)
+        if item is None:
+            return
+        self.large.discard(name)
+        for cell in item[1]:
+            names = self.cells[cell]
+            names.discard(name)
+            if not names:
+                del self.cells[cell]
+        if item[1]:
+            first, last = self.get_cells(item[0])
+            for axis in range(3):
+                for index in range(first[axis], last[axis] + 1):
+                    names = self.layers[axis][index]
+                    names.discard(name)
+                    if not names:
+                        del self.layers[axis][index]
+
+
+    def query_box(self, bound_box):
+        """Return the names of the objects whose bound box intersects the
+        given bound box.
+        """
+        first, last = self.get_cells(bound_box)
+        count = 1
+        for i in range(3):
+            count *= last[i] - first[i] + 1
+        names = set(self.large)
+        if count > len(self.cells):
+            for cell, cell_names in self.cells.items():
+                if all(first[i] <= cell[i] <= last[i] for i in range(3)):
+                    names.update(cell_names)
+        else:
+            for i in range(first[0], last[0] + 1):
+                for j in range(first[1], last[1] + 1):
+                    for k in range(first[2], last[2] + 1):
+                        names.update(self.cells.get((i, j, k), ()))
+        return [n for n in names if self.items[n][0].intersect(bound_box)]
+
+
+    def query_slab(self, placement, z_min, z_max):
+        """Return the names of the objects whose bound box intersects the
+        slab between z_min and z_max along the Z axis of the given
+        placement, such as the region around a section plane.
+
+        If the slab is normal to a global axis, as for plans and most
+        elevations, only the cell layers it crosses along that axis are
+        visited. Otherwise every occupied cell is tested, and the index
+        only prunes the exact bound box tests.
+        """
+        inverse_placement = placement.inverse()
+
+        def in_slab(bound_box):
+            local_bound_box = get_local_bound_box(bound_box, inverse_placement)
+            return local_bound_box.ZMax >= z_min and local_bound_box.ZMin <= z_max
+
+        names = set(self.large)
+        normal = placement.Rotation.multVec(App.Vector(0, 0, 1))
+        normal = (normal.x, normal.y, normal.z)
+        origin = placement.Base
+        origin = (origin.x, origin.y, origin.z)
+        for axis in range(3):
+            if abs(abs(normal[axis]) - 1) < 1e-9:
+                bounds = sorted((origin[axis] + normal[axis] * z_min,
+                                 origin[axis] + normal[axis] * z_max))
+                first = int(math.floor(bounds[0] / self.cell_size))
+                last = int(math.floor(bounds[1] / self.cell_size))
+                if last - first + 1 < len(self.layers[axis]):
+                    for index in range(first, last + 1):
+                        names.update(self.layers[axis].get(index, ()))
+                else:
+                    for index, layer_names in self.layers[axis].items():
+                        if first <= index <= last:
+                            names.update(layer_names)
+                break
+        else:
+            for cell, cell_names in self.cells.items():
+                if in_slab(self.get_cell_bound_box(cell)):
+                    names.update(cell_names)
+        return [n for n in names if in_slab(self.items[n][0])]
+
+
+class SpatialIndexObserver(object):
+    """Document observer keeping the spatial indexes up to date."""
+
+    def slotChangedObject(self, obj, prop):
+        if prop in ("Shape", "Placement"):
+            index = _INDEXES.get(obj.Document.Name)
+            if index:
+                index.update(obj)
+                if prop == "Placement":
+                    index.update_children(obj)
+
+    def slotDeletedObject(self, obj):
+        index = _INDEXES.get(obj.Document.Name)
+        if index:
+            index.remove(obj.Name)
+
+    def slotDeletedDocument(self, doc):
+        _INDEXES.pop(doc.Name, None)
+
+
+def get_spatial_index(doc):
+    """
+    get_spatial_index(doc)
+
+    Return the spatial index of the given document, building it the
+    first time. The index is then updated incrementally.
+    """
+    global _OBSERVER
+    if _OBSERVER is None:
+        _OBSERVER = SpatialIndexObserver()
+        App.addDocumentObserver(_OBSERVER)
+
+    index = _INDEXES.get(doc.Name)
+    if index is None:
+        index = SpatialIndex()
+        index.build(doc)
+        _INDEXES[doc.Name] = index
+    return index
+
+
+def get_global_shape(obj):
+    """Return the shape of the given object placed in the global coordinate
+    system. The shape of an object grouped into a GeoFeatureGroup (e.g. an
+    opening into its wall) is expressed in the group coordinate system.
+    The returned shape shares the object geometry.
+    """
+    shape = obj.Shape
+    parent = obj.getParentGeoFeatureGroup() if hasattr(obj, "getParentGeoFeatureGroup") else None
+    if parent:
+        shape.Placement = parent.getGlobalPlacement().multiply(shape.Placement)
+    return shape
+
+
+def get_bound_box_key(bound_box):
+    """Return a hashable tuple describing the given bound box."""
+    return (bound_box.XMin, bound_box.YMin, bound_box.ZMin,
+            bound_box.XMax, bound_box.YMax, bound_box.ZMax)
+
+
+def get_local_bound_box(bound_box, inverse_placement):
+    """Return the axis aligned bound box, in the coordinate system defined
+    by the given inverse placement, enclosing the given global bound box.
+    """
+    local_bound_box = App.BoundBox()
+    for i in range(8):
+        local_bound_box.add(inverse_placement.multVec(bound_box.getPoint(i)))
+    return local_bound_box
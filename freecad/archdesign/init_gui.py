@@ -13,7 +13,7 @@ class ArchDesign(Gui.Workbench):
     ToolTip = "a simple template workbench"
     Icon = os.path.join(ICONPATH, "ArchDesign_Workbench.svg")
     toolbox_objects = ['MakeWall', 'JoinWalls', 'ExtendWall',
-               'MakeOpeningElement','MakeDoor', 'MakeWindow',
+               'MakeOpeningElement','MakeDoor', 'MakeWindow', 'LayoutOpenings',
                'MakeView'
               ]
     toolbox_containers = ['Project', 'Site', 'Storey',
@@ -34,6 +34,7 @@ class ArchDesign(Gui.Workbench):
         from freecad.archdesign.commands.openings import MakeOpeningElement
         from freecad.archdesign.commands.openings import MakeDoor
         from freecad.archdesign.commands.openings import MakeWindow
+        from freecad.archdesign.commands.openings import LayoutOpenings
         from freecad.archdesign.commands.joinwalls import JoinWalls
         from freecad.archdesign.commands.joinwalls import ExtendWall
 
@@ -54,6 +55,7 @@ class ArchDesign(Gui.Workbench):
         Gui.addCommand('MakeOpeningElement', MakeOpeningElement())
         Gui.addCommand('MakeDoor', MakeDoor())
         Gui.addCommand('MakeWindow', MakeWindow())
+        Gui.addCommand('LayoutOpenings', LayoutOpenings())
 
         Gui.addCommand('MakeView', MakeView())
 
@@ -28,6 +28,21 @@ This object is a spaghetti Frankenstein of various code written by Yorik.
 from PySide.QtCore import QT_TRANSLATE_NOOP
 import FreeCAD as App
 
+import freecad.archdesign.functions.parallel_section as parallel_section
+import freecad.archdesign.functions.plan_view as plan_view
+import freecad.archdesign.functions.spatial_index as spatial_index
+from freecad.archdesign.objects.base import Component
+
+
+# Objects closer than this to the section plane are considered crossing it.
+SECTION_TOLERANCE = 0.001
+# Margin added around the objects extent when sizing the section plane.
+SECTION_PLANE_MARGIN = 1000.0
+# Delay, in milliseconds, of the section update after a recompute in the GUI.
+UPDATE_DELAY = 200
+
+_OBSERVER = None
+
 
 class ArchView(object):
     """
@@ -44,6 +59,14 @@ class ArchView(object):
             self.execute(obj)
 
         self.Type = 'Arch_View'
+        self.svgcache = None
+        self.shapecache = None
+        self.projectioncache = None
+        self.dirty = set()
+        self.update_timer = None
+        self.section_stats = (0, 0)
+        self.projection_stats = (0, 0)
+        self.skipped_updates = 0
 
 
     def set_properties(self, obj):
@@ -84,6 +107,14 @@ class ArchView(object):
             obj.addProperty("App::PropertyLinkChild", "SectionGeometry",
                             "Geometry", QT_TRANSLATE_NOOP("App::Property","If true, a new object is generated to display the section cut shape."))
 
+        if not "Depth" in pl:
+            obj.addProperty("App::PropertyLength", "Depth",
+                            "Section Plane", QT_TRANSLATE_NOOP("App::Property","The depth of the view beyond the section plane. Objects whose bounding box is not between the section plane and this depth are ignored. 0 means only the objects crossing the section plane."))
+
+        if not "AnalyticPlan" in pl:
+            obj.addProperty("App::PropertyBool", "AnalyticPlan",
+                            "Section Plane", QT_TRANSLATE_NOOP("App::Property","If true, walls are drawn from their parameters, with door and window symbols, instead of being sectioned. Only applies to section planes parallel to the walls base."))
+
         self.Type = "SectionPlane"
 
 
@@ -92,6 +123,7 @@ class ArchView(object):
         # print("running" + obj.Name + "attach() method\n")
         obj.addExtension('App::GeoFeatureGroupExtensionPython')
         self.set_properties(obj)
+        register_observer()
 
 
     def execute(self, obj):
@@ -123,7 +155,13 @@ class ArchView(object):
 
     def onChanged(self, obj, prop):
         """this method is activated when a property changes"""
-        if prop in ["Placement","Objects","OnlySolids","UseMaterialColorForFill","Clip"]:
+        if prop in ["Placement","Objects","OnlySolids","UseMaterialColorForFill","Clip","Depth"]:
+            # shapecache items are keyed on the view placement and on the
+            # objects shapes, so they are still valid here
+            self.svgcache = None
+
+        if prop == "AnalyticPlan":
+            # cached pieces do not depend on the drawing mode
             self.svgcache = None
             self.shapecache = None
 
@@ -134,7 +172,9 @@ class ArchView(object):
         
         if prop == 'Objects' and hasattr(obj, 'Objects'):
             if hasattr(obj, 'GenerateSectionGeometry') and obj.GenerateSectionGeometry:
-                self.recomputeSectionGeometry(obj)
+                # coalesce consecutive edits: the section is updated after the
+                # GUI idle timeout, or by the next document recompute
+                self.request_update(obj, {obj.Name}, schedule=App.GuiUp)
 
 
     def getNormal(self, obj):
@@ -163,41 +203,313 @@ class ArchView(object):
 
 
     def recomputeSectionGeometry(self, obj):
-        if obj.Objects is None or len(obj.Objects) == 0:
-            return
         if obj.Visibility == False:
             return
         if App.GuiUp and obj.ViewObject.DisplayMode != 'Group':
             return
 
         import Part
-        import Drawing
 
-        section_plane = Part.makePlane(10000000.0, 10000000.0)
-        section_plane.Placement.Base.x = -5000000.0
-        section_plane.Placement.Base.y = -5000000.0
-        npl = section_plane.Placement.multiply(obj.getGlobalPlacement())
-        section_plane.Placement = npl
+        shapecache = self.get_section_pieces(obj)
+        pieces = [piece for key, piece, source in shapecache.values() if not piece.isNull()]
+
+        if not pieces:
+            obj.SectionGeometry.Shape = Part.Shape()
+            return
+        shape = Part.makeCompound(pieces)
+        # pieces are global, SectionGeometry is placed in the view group
+        shape.Placement = obj.getGlobalPlacement().inverse().multiply(shape.Placement)
+
+        obj.SectionGeometry.Shape = shape
+
 
-        #shapes = Drawing.projectEx(obj.Objects[0].Shape, self.getNormal(obj))
-        shapes = []
-        for o in obj.Objects:
-            s = o.Shape.copy()
-            # s.Placement.multiply(o.getGlobalPlacement())
-            shapes.append(s)
-        shapes = Part.makeCompound(shapes)
+    # Incremental update ++++++++++++++++++++++++++++++++++++++++++++++++++++
 
-        shape = shapes.section(section_plane)
+    def mark_dirty(self, obj, touched):
+        """Add to the dirty set the given recomputed object names that
+        contribute to the view, and schedule a section update if any.
+        The view itself is marked dirty when its placement is recomputed.
+        """
+        if not getattr(obj, "GenerateSectionGeometry", False) or not obj.SectionGeometry:
+            return
+        if obj.Name in touched:
+            dirty = {obj.Name}
+        elif obj.Objects:
+            # objects move also with the groups they belong to
+            dirty = set()
+            for o in obj.Objects:
+                parent = o
+                while parent:
+                    if parent.Name in touched:
+                        dirty.add(o.Name)
+                        break
+                    parent = parent.getParentGeoFeatureGroup()
+        else:
+            dirty = set()
+            for name in touched:
+                o = obj.Document.getObject(name)
+                if o and isinstance(getattr(o, "Proxy", None), Component):
+                    dirty.add(name)
+                elif o and o.hasExtension("App::GeoFeatureGroupExtension"):
+                    # a moved group moves the components it holds
+                    dirty.add(name)
+        if not dirty:
+            return
+        self.request_update(obj, dirty)
+
+
+    def request_update(self, obj, names, schedule=True):
+        """Add the given object names to the dirty set and, if schedule is
+        True, schedule a section update (see schedule_update).
+        Requests arriving while an update is pending are merged into it, and
+        counted in skipped_updates for diagnostics.
+        """
+        if getattr(self, "dirty", None) is None:
+            self.dirty = set()
+        if self.dirty:
+            self.skipped_updates = getattr(self, "skipped_updates", 0) + 1
+        self.dirty.update(names)
+        if schedule:
+            self.schedule_update(obj)
+
+
+    def schedule_update(self, obj):
+        """Update the section geometry after UPDATE_DELAY milliseconds in
+        the GUI, so rapid edits coalesce in a single update, or at once
+        when running headless.
+        """
+        if not App.GuiUp:
+            self.update_section(obj.Document.Name, obj.Name)
+            return
 
-        shape.Placement.multiply(obj.getGlobalPlacement().inverse())
+        from PySide import QtCore
 
-        obj.SectionGeometry.Shape = shape
+        if getattr(self, "update_timer", None) is None:
+            self.update_timer = QtCore.QTimer()
+            self.update_timer.setSingleShot(True)
+            doc_name, name = obj.Document.Name, obj.Name
+            self.update_timer.timeout.connect(lambda: self.update_section(doc_name, name))
+        # restarting the timer postpones the pending update
+        self.update_timer.start(UPDATE_DELAY)
+
+
+    def update_section(self, doc_name, name):
+        """Recompute the section geometry of the given view, if it has
+        dirty objects. Only the dirty objects are sectioned again, the
+        others are taken from shapecache.
+        """
+        if not self.dirty:
+            return
+        self.dirty = set()
+        doc = App.listDocuments().get(doc_name)
+        obj = doc.getObject(name) if doc else None
+        if obj is None or not obj.SectionGeometry:
+            return
+        self.recomputeSectionGeometry(obj)
+
+
+    def get_section_candidates(self, obj, objects):
+        """Return a list of (object, global shape, local bound box) tuples of
+        the given objects whose bound box crosses the section plane or lies
+        within the view Depth beyond it. The global shape is the object
+        shape placed in the global coordinate system, as the view is
+        (see spatial_index.get_global_shape).
+        The local bound box is expressed in the view coordinate system: the
+        view looks along its -Z axis, so an object with a negative ZMax lies
+        beyond the section plane without crossing it.
+        """
+        inverse_placement = obj.getGlobalPlacement().inverse()
+        depth = obj.Depth.Value if hasattr(obj, "Depth") else 0.0
+
+        candidates = []
+        for o in objects:
+            if not hasattr(o, "Shape") or o.Shape.isNull():
+                continue
+            shape = spatial_index.get_global_shape(o)
+            if obj.OnlySolids and not shape.Solids:
+                continue
+            bb = spatial_index.get_local_bound_box(shape.BoundBox, inverse_placement)
+            if bb.ZMin > SECTION_TOLERANCE or bb.ZMax < -depth - SECTION_TOLERANCE:
+                continue
+            candidates.append((o, shape, bb))
+        return candidates
+
+
+    def get_section_pieces(self, obj):
+        """Return the section pieces of the view objects, as a dictionary
+        of object name: (cache key, section shape, source shape) items,
+        the source shape being the global object shape the section was
+        computed from. Only the objects whose shape or placement changed
+        since the last call are sectioned again (see shapecache). The number of reused
+        and computed pieces is kept in section_stats.
+        """
+        if obj.Objects:
+            objects = obj.Objects
+        else:
+            objects = self.get_document_objects(obj)
+        candidates = self.get_section_candidates(obj, objects)
+
+        if getattr(self, "shapecache", None) is None:
+            self.shapecache = {}
+        view_key = get_placement_key(obj.getGlobalPlacement())
+        shapecache = {}
+        to_section = []
+        analytic_walls = set()
+        hosted_openings = []
+        computed = 0
+        for o, shape, bb in candidates:
+            if bb.ZMax < -SECTION_TOLERANCE:
+                # only beyond the section plane, nothing to cut
+                continue
+            if getattr(obj, "AnalyticPlan", False):
+                if plan_view.get_opening_host(o):
+                    # drawn by the host wall plan, if any
+                    hosted_openings.append((o, shape, bb))
+                    continue
+            key = (shape.hashCode(), get_placement_key(shape.Placement), view_key)
+            cached = self.shapecache.get(o.Name)
+            if cached and cached[0][:3] == key and cached[2].isSame(shape):
+                # hash codes of freed shapes can be reused, so the entry is
+                # also checked against the shape it was computed from.
+                # Objects no more in the view are dropped from the cache
+                shapecache[o.Name] = cached
+                if len(cached[0]) > 3:
+                    analytic_walls.add(o.Name)
+                continue
+            plan = None
+            if getattr(obj, "AnalyticPlan", False):
+                plan = plan_view.get_wall_plan_shape(o, obj.getGlobalPlacement())
+            if plan is not None:
+                # plan keys are marked to tell them from section keys
+                shapecache[o.Name] = (key + ("Plan",), plan, shape)
+                analytic_walls.add(o.Name)
+                computed += 1
+            else:
+                to_section.append((o.Name, key, shape,
+                                   self.get_section_plane(obj, [bb])))
+
+        for o, shape, bb in hosted_openings:
+            if plan_view.get_opening_host(o).Name in analytic_walls:
+                continue
+            key = (shape.hashCode(), get_placement_key(shape.Placement), view_key)
+            cached = self.shapecache.get(o.Name)
+            if cached and cached[0] == key and cached[2].isSame(shape):
+                shapecache[o.Name] = cached
+            else:
+                to_section.append((o.Name, key, shape,
+                                   self.get_section_plane(obj, [bb])))
+
+        if to_section:
+            names, keys, shapes, planes = zip(*to_section)
+            sections = parallel_section.section_shapes(shapes, planes)
+            for name, key, piece, shape in zip(names, keys, sections, shapes):
+                shapecache[name] = (key, piece, shape)
+        computed += len(to_section)
+        self.section_stats = (len(shapecache) - computed, computed)
+        self.shapecache = shapecache
+        return shapecache
+
+
+    def get_projection_pieces(self, obj):
+        """Return the hidden line projections of the view objects lying
+        within the view Depth beyond the section plane, as a dictionary of
+        object name: (cache key, (visible edges, hidden edges), source
+        shape) items. The edges are expressed in the view coordinate system.
+        Objects crossing the section plane are clipped to the part beyond
+        it. Only the objects whose shape or placement changed since the
+        last call are projected again (see projectioncache). The number of
+        reused and computed projections is kept in projection_stats.
+        """
+        import Part
+
+        depth = obj.Depth.Value if hasattr(obj, "Depth") else 0.0
+        if not depth:
+            self.projection_stats = (0, 0)
+            return {}
+
+        if obj.Objects:
+            objects = obj.Objects
+        else:
+            objects = self.get_document_objects(obj)
+        candidates = self.get_section_candidates(obj, objects)
+
+        if getattr(self, "projectioncache", None) is None:
+            self.projectioncache = {}
+        inverse_placement = obj.getGlobalPlacement().inverse()
+        view_key = get_placement_key(obj.getGlobalPlacement())
+        projectioncache = {}
+        to_project = []
+        for o, shape, bb in candidates:
+            key = (shape.hashCode(), get_placement_key(shape.Placement), view_key)
+            cached = self.projectioncache.get(o.Name)
+            if cached and cached[0] == key and cached[2].isSame(shape):
+                projectioncache[o.Name] = cached
+                continue
+            source = shape
+            shape = shape.copy()
+            shape.Placement = inverse_placement.multiply(shape.Placement)
+            if bb.ZMax > -SECTION_TOLERANCE:
+                # crossing the section plane: keep only the part beyond it
+                if bb.ZMin >= 0:
+                    continue
+                box = Part.makeBox(bb.XLength + 2, bb.YLength + 2, -bb.ZMin,
+                                   App.Vector(bb.XMin - 1, bb.YMin - 1, bb.ZMin))
+                shape = shape.common(box)
+                if shape.isNull() or not shape.Edges:
+                    continue
+            to_project.append((o.Name, key, shape, source))
+
+        if to_project:
+            names, keys, shapes, sources = zip(*to_project)
+            projections = parallel_section.project_shapes(shapes)
+            for name, key, projection, source in zip(names, keys, projections, sources):
+                projectioncache[name] = (key, projection, source)
+        self.projection_stats = (len(projectioncache) - len(to_project), len(to_project))
+        self.projectioncache = projectioncache
+        return projectioncache
+
+
+    def get_document_objects(self, obj):
+        """Return the shaped ArchDesign objects of the document near the
+        section plane, as found by the document spatial index. Used when
+        the Objects list is empty.
+        """
+        depth = obj.Depth.Value if hasattr(obj, "Depth") else 0.0
+        index = spatial_index.get_spatial_index(obj.Document)
+        names = index.query_slab(obj.getGlobalPlacement(),
+                                 -depth - SECTION_TOLERANCE, SECTION_TOLERANCE)
+        objects = []
+        for name in names:
+            o = obj.Document.getObject(name)
+            if o and isinstance(getattr(o, "Proxy", None), Component):
+                objects.append(o)
+        return objects
+
+
+    def get_section_plane(self, obj, bound_boxes):
+        """Return a planar face lying on the section plane, just larger
+        than the extent of the given local bound boxes
+        (see get_section_candidates).
+        """
+        import Part
+
+        extent = App.BoundBox()
+        for bb in bound_boxes:
+            extent.add(bb)
+        extent.enlarge(SECTION_PLANE_MARGIN)
+
+        section_plane = Part.makePlane(extent.XLength, extent.YLength,
+                                       App.Vector(extent.XMin, extent.YMin, 0))
+        section_plane.Placement = obj.getGlobalPlacement()
+        return section_plane
 
 
     # Other methods +++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
     def onDocumentRestored(self, obj):
         self.Object = obj
+        self.set_properties(obj)
+        register_observer()
         # obj.Proxy.Type needs to be re-setted every time the document is opened.
         obj.Proxy.Type = "Arch_View"
 
@@ -207,4 +519,48 @@ class ArchView(object):
 
 
     def __setstate__(self,_state):
-        return
\ No newline at end of file
+        self.svgcache = None
+        self.shapecache = None
+        self.projectioncache = None
+        self.dirty = set()
+        self.update_timer = None
+        self.section_stats = (0, 0)
+        self.projection_stats = (0, 0)
+        self.skipped_updates = 0
+        return
+
+
+class ArchViewObserver(object):
+    """Document observer collecting the objects recomputed by every
+    document recompute and passing them to the document views
+    (see ArchView.mark_dirty).
+    """
+    def __init__(self):
+        self.touched = {}
+
+    def slotRecomputedObject(self, obj):
+        self.touched.setdefault(obj.Document.Name, set()).add(obj.Name)
+
+    def slotRecomputedDocument(self, doc):
+        touched = self.touched.pop(doc.Name, None)
+        if not touched:
+            return
+        for o in doc.Objects:
+            if isinstance(getattr(o, "Proxy", None), ArchView):
+                o.Proxy.mark_dirty(o, touched)
+
+    def slotDeletedDocument(self, doc):
+        self.touched.pop(doc.Name, None)
+
+
+def register_observer():
+    """Register the ArchViewObserver, once per session."""
+    global _OBSERVER
+    if _OBSERVER is None:
+        _OBSERVER = ArchViewObserver()
+        App.addDocumentObserver(_OBSERVER)
+
+
+def get_placement_key(placement):
+    """Return a hashable tuple describing the given placement."""
+    return tuple(placement.Base) + tuple(placement.Rotation.Q)
\ No newline at end of file
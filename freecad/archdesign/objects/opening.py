@@ -31,6 +31,17 @@ from freecad.archdesign.objects.base import Component
 
 import freecad.archdesign.objects.preset_windows as window_presets
 
+
+FILL_TYPES = ["None", "Preset Door", "Preset Window", "By Sketch", "By Type", "Custom"]
+
+# Default Sill and Preset Door dimensions, shared by their shapes and by
+# the opening envelope void (see get_envelope_parameters).
+SILL_THICKNESS = 50.0
+SILL_FRONT_PROTRUSION = 50.0
+SILL_LATERAL_PROTRUSION = 50.0
+SILL_INNER_COVERING = 30.0
+DOOR_LEAF_THICKNESS = 60.0
+
 class Opening(Component):
     def __init__(self, obj=None):
         super(Opening, self).__init__(obj)
@@ -66,11 +77,16 @@ class Opening(Component):
             obj.Shape = Part.Shape()
 
         # VOID
-        vs = self.get_void_shape(obj)
+        # the void is rebuilt only when the values it depends on change
+        void_key = self.get_void_key(obj)
+        if (void_key is None or void_key != getattr(self, "void_key", None)
+                or obj.VoidShape.isNull()):
+            vs = self.get_void_shape(obj)
 
-        # create object negative shape
-        if vs:
-            obj.VoidShape = vs
+            # create object negative shape
+            if vs:
+                obj.VoidShape = vs
+            self.void_key = void_key
 
 
     def set_properties(self, obj):
@@ -100,7 +116,7 @@ class Opening(Component):
         _tip = 'List of available shapes for the Fill element.\n'\
                'Chose Custom to use the Fill Element object shape.'
         obj.addProperty('App::PropertyEnumeration', 'Fill', 
-                        'Component - Filling', _tip).Fill = ["None", "Preset Door", "Preset Window", "By Sketch", "Custom"]
+                        'Component - Filling', _tip).Fill = FILL_TYPES
 
         _tip = 'Alignment of the Fill Element according to the Host Thickness property.'
         obj.addProperty('App::PropertyEnumeration', 'FillAlignment', 
@@ -120,6 +136,11 @@ class Opening(Component):
         obj.addProperty('App::PropertyEnumeration', 'FillMode', 
                         'Component - Filling', _tip).FillMode = ["Embed Shape", "Display Child"]
 
+        self.set_type_properties(obj)
+
+        # COMPONENTS - FILLING OPTIONS Properties (presets) -----------------
+        self.set_filling_options_properties(obj)
+
         # COMPONENTS - VOID Properties (not implemented yet) ----------------------------
         _tip = 'List of available shapes of the Opening void.\n'\
                'Chose Custom to use the Void Element object shape.'
@@ -155,8 +176,50 @@ class Opening(Component):
                         'Geometry', _tip).PropagateGeometry = False
 
 
+    def set_type_properties(self, obj):
+        """Declare the properties used to fill the opening with an opening
+        type, and the "By Type" Fill value, if missing.
+        """
+        pl = obj.PropertiesList
+
+        if 'Fill' in pl and not "By Type" in obj.getEnumerationsOfProperty('Fill'):
+            # objects created before opening types were introduced
+            fill = obj.Fill
+            obj.Fill = FILL_TYPES
+            obj.Fill = fill
+
+        if not 'OpeningType' in pl:
+            _tip = 'Link the opening type that you want to insert into the opening.\n'\
+                   'The type can be stored in this document or in an external library.\n'\
+                   'It is displayed through an App::Link, so its geometry is\n'\
+                   'shared by all the openings of the same type.\n'\
+                   'To use it, set Fill property to By Type'
+            obj.addProperty('App::PropertyXLink', 'OpeningType', 
+                            'Component - Filling', _tip)
+
+        if not 'FillLink' in pl:
+            _tip = 'App::Link object used to display the Opening Type into the opening.'
+            obj.addProperty('App::PropertyLinkChild', 'FillLink', 
+                            'Component - Filling', _tip)
+            obj.setEditorMode('FillLink', 2)
+
+
+    def set_filling_options_properties(self, obj):
+        """Declare the 'Component - Filling - Options' properties of every
+        fill preset once, so switching Fill or FillType only toggles their
+        visibility instead of adding and removing properties.
+        """
+        window_presets.add_preset_window_properties(obj)
+        window_presets.add_preset_window_subproperties(obj)
+        self.update_filling_properties(obj)
+
+
     def onDocumentRestored(self, obj):
         self.Object = obj
+        if 'Fill' in obj.PropertiesList:
+            # objects created before the filling options schema was declared
+            self.set_filling_options_properties(obj)
+            self.set_type_properties(obj)
 
 
     def onChanged(self, obj, prop):
@@ -173,13 +236,15 @@ class Opening(Component):
         if prop == 'AdditionElements' and 'AdditionElements' in obj.PropertiesList:
             pass
 
-        if prop == 'Fill' and 'Fill' in obj.PropertiesList:
-            self.remove_filling_properties(obj)
-            self.setup_filling_properties(obj)
-
-        if prop == 'FillType' and 'FillType' in obj.PropertiesList:
+        if prop in ('Fill', 'FillType') and 'Fill' in obj.PropertiesList:
             # this is used to mathch filling preset properties
-            self.sync_filling_preset_subproperties(obj)
+            self.update_filling_properties(obj)
+
+        if (prop in ('Fill', 'OpeningType', 'FillAlignment', 'FillDisplacement', 'HostThickness')
+                and 'OpeningType' in obj.PropertiesList):
+            # the link is a separate object: it is managed here and not in
+            # execute, which does not touch other objects during a recompute
+            self.update_fill_link(obj)
 
         if 'Void' in obj.PropertiesList and prop == 'Void':
             pass
@@ -188,32 +253,13 @@ class Opening(Component):
             pass
 
 
-    def remove_filling_properties(self, obj):
-        """Remove 'Component - Filling - Options' properties when not used.
+    def update_filling_properties(self, obj):
+        """Show the 'Component - Filling - Options' properties used by the
+        chosen Fill and FillType, and hide the others.
         """
-        for property in obj.PropertiesList:
-            if obj.getGroupOfProperty(property) != "Component - Filling - Options":
-                continue
-            obj.removeProperty(property)   
-
-    def setup_filling_properties(self, obj):
-        if obj.Fill == "None":
+        if not 'Fill' in obj.PropertiesList:
             return
-        if obj.Fill == "Preset Window":
-            window_presets.add_preset_window_properties(obj)
-            self.sync_filling_preset_subproperties(obj)
-        if obj.Fill == "Preset Door":
-            pass
-
-    def sync_filling_preset_subproperties(self, obj):
-        """Add 'Component - Filling - Options' subproperties according to chosen preset type.
-        """
-        for property in obj.PropertiesList:
-            if (obj.getGroupOfProperty(property) != "Component - Filling - Options" or 
-                property == 'FillType'):
-                continue
-            obj.removeProperty(property)   
-        window_presets.add_preset_window_subproperties(obj)
+        window_presets.show_preset_window_properties(obj, obj.Fill == "Preset Window")
 
     # ADDITIONS ++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
@@ -234,10 +280,10 @@ class Opening(Component):
         
         return window_presets.default_sill(opening_width=obj.OpeningWidth.Value,
                                            host_thickness=obj.HostThickness.Value,
-                                           sill_thickness=50.0,
-                                           front_protrusion=50.0,
-                                           lateral_protrusion=50.0,
-                                           inner_covering=30.0)
+                                           sill_thickness=SILL_THICKNESS,
+                                           front_protrusion=SILL_FRONT_PROTRUSION,
+                                           lateral_protrusion=SILL_LATERAL_PROTRUSION,
+                                           inner_covering=SILL_INNER_COVERING)
 
 
     # FILLING ++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
@@ -272,25 +318,62 @@ class Opening(Component):
 
         if f_shape:
             # set the correct placement of filling shape according to alignment and displacement
-            if obj.FillAlignment == "Left":
-                f_shape.Placement.Base.y = obj.HostThickness.Value/2
-            elif obj.FillAlignment == "Center":
-                pass
-            elif obj.FillAlignment == "Right":
-                f_shape.Placement.Base.y = -obj.HostThickness.Value/2
-            f_shape.Placement.Base.y += obj.FillDisplacement.Value
+            f_shape.Placement.Base.y = self.get_fill_y(obj, f_shape.Placement.Base.y)
             return f_shape
         else:
             return None
 
 
+    def get_fill_y(self, obj, y=0.0):
+        """Return the Y coordinate of the fill element according to
+        FillAlignment and FillDisplacement. y is kept for Center alignment.
+        """
+        if obj.FillAlignment == "Left":
+            y = obj.HostThickness.Value/2
+        elif obj.FillAlignment == "Center":
+            pass
+        elif obj.FillAlignment == "Right":
+            y = -obj.HostThickness.Value/2
+        return y + obj.FillDisplacement.Value
+
+
+    def update_fill_link(self, obj):
+        """Display the OpeningType into the opening through an App::Link child.
+
+        The link is created once, then changing the OpeningType only changes
+        the linked object, without rebuilding or copying any geometry.
+        """
+        if not 'FillLink' in obj.PropertiesList or 'Restore' in obj.State:
+            return
+        link = obj.FillLink
+        if obj.Fill != "By Type" or not obj.OpeningType:
+            if link and link.Visibility:
+                link.Visibility = False
+            return
+
+        if link is None:
+            link = obj.Document.addObject('App::Link', 'FillLink')
+            obj.addObject(link)
+            obj.FillLink = link
+        if link.LinkedObject != obj.OpeningType:
+            link.LinkedObject = obj.OpeningType
+        if not link.Visibility:
+            link.Visibility = True
+
+        y = self.get_fill_y(obj)
+        if link.Placement.Base.y != y:
+            placement = link.Placement
+            placement.Base.y = y
+            link.Placement = placement
+
+
     def get_preset_door_shape(self, obj):
         import Part
 
         if (not 'OpeningWidth' in obj.PropertiesList or
             not 'OpeningHeight' in obj.PropertiesList):
             return None
-        f = Part.makeBox(obj.OpeningWidth,60,obj.OpeningHeight)
+        f = Part.makeBox(obj.OpeningWidth,DOOR_LEAF_THICKNESS,obj.OpeningHeight)
         m = App.Matrix()
         m.move(-obj.OpeningWidth/2, 0, 0)
         f = f.transformGeometry(m)
@@ -307,6 +390,11 @@ class Opening(Component):
     def get_void_shape(self, obj):
         import Part
         void = None
+
+        if obj.VoidSubtractAll and self.get_envelope_parameters(obj):
+            # preset fills have a known outer profile: no need to fuse their solids
+            return self.get_envelope_void(obj)
+
         if obj.Void == "Rectangular":
             if obj.Addition == "None":
                 void = self.get_rectangular_void(obj)
@@ -318,10 +406,142 @@ class Opening(Component):
             ps = []
             for s in obj.Shape.Solids:
                 ps.append(s.copy())
+            ps.extend(self.get_type_solids(obj))
             void = void.fuse(ps)
 
         return void
 
+    def get_type_solids(self, obj):
+        """Return copies of the solids of the linked OpeningType, placed as
+        the FillLink displays them, when the opening is filled By Type.
+        The type is not part of the opening Shape, being displayed through
+        an App::Link.
+        """
+        if (obj.Fill != "By Type" or not 'OpeningType' in obj.PropertiesList
+                or not obj.OpeningType or not hasattr(obj.OpeningType, "Shape")):
+            return []
+        # the link placement replaces the type placement (see update_fill_link)
+        placement = obj.Placement.multiply(
+            App.Placement(App.Vector(0, self.get_fill_y(obj), 0), App.Rotation()))
+        placement = placement.multiply(obj.OpeningType.Placement.inverse())
+        solids = []
+        for s in obj.OpeningType.Shape.Solids:
+            solid = s.copy()
+            solid.Placement = placement.multiply(solid.Placement)
+            solids.append(solid)
+        return solids
+
+    def get_void_key(self, obj):
+        """Return a tuple of the values the opening void shape depends on,
+        or None if the void cannot be cached.
+        """
+        if obj.Void != "Rectangular":
+            # the void depends on other objects
+            return None
+        envelope = None
+        if obj.VoidSubtractAll:
+            envelope = self.get_envelope_parameters(obj)
+            if envelope is None:
+                # the void depends on the opening positive shape
+                return None
+        return (obj.Void, obj.Addition,
+                obj.OpeningWidth.Value, obj.OpeningHeight.Value, obj.HostThickness.Value,
+                tuple(obj.Placement.toMatrix().A), envelope)
+
+    def get_envelope_parameters(self, obj):
+        """Return the outer bounding profile of the opening as a tuple
+        (width, height, sill_width, sill_height, y_min, y_max), computed from
+        the void, fill and addition preset parameters.
+
+        Return None if the opening has a custom fill, addition or void, whose
+        envelope cannot be known without looking at its shape.
+        """
+        if (obj.Void != "Rectangular" or
+                obj.Addition not in ("None", "Default Sill") or
+                obj.Fill not in ("None", "Preset Window", "Preset Door")):
+            return None
+
+        host_th = obj.HostThickness.Value
+        width = obj.OpeningWidth.Value
+        height = obj.OpeningHeight.Value
+        # Y range of the rectangular void
+        y_min = -host_th/2
+        y_max = host_th/2 + 50
+
+        fill_th = 0.0
+        if obj.Fill == "Preset Window":
+            if not 'FillType' in obj.PropertiesList or obj.FillType != 'Rectangular':
+                return None
+            width = max(width, width + obj.IncreaseWidth.Value)
+            height = max(height, height + obj.IncreaseHeight.Value)
+            fill_th = obj.FrameThickness.Value
+        elif obj.Fill == "Preset Door":
+            fill_th = DOOR_LEAF_THICKNESS
+        if fill_th:
+            fill_y = self.get_fill_y(obj)
+            y_min = min(y_min, fill_y)
+            y_max = max(y_max, fill_y + fill_th)
+
+        sill_width = 0.0
+        sill_height = 0.0
+        if obj.Addition == "Default Sill":
+            sill_width = obj.OpeningWidth.Value + SILL_LATERAL_PROTRUSION * 2
+            sill_height = SILL_THICKNESS
+            y_max = max(y_max, host_th/2 + SILL_FRONT_PROTRUSION)
+
+        return (width, height, sill_width, sill_height, y_min, y_max)
+
+    def get_envelope_void(self, obj):
+        """Return a single solid enclosing the opening void, fill and
+        addition, extruded from their outer profile in the XZ plane.
+        It replaces the fusion of the void with the opening solids
+        when VoidSubtractAll is set on preset openings.
+        """
+        import Part
+        width, height, sill_width, sill_height, y_min, y_max = self.get_envelope_parameters(obj)
+
+        if sill_height and sill_width > width:
+            # opening profile standing on the wider sill profile
+            points = [(-sill_width/2, -sill_height), (sill_width/2, -sill_height),
+                      (sill_width/2, 0), (width/2, 0), (width/2, height),
+                      (-width/2, height), (-width/2, 0), (-sill_width/2, 0)]
+        else:
+            points = [(-width/2, -sill_height), (width/2, -sill_height),
+                      (width/2, height), (-width/2, height)]
+        points.append(points[0])
+
+        polygon = Part.makePolygon([App.Vector(x, y_min, z) for x, z in points])
+        void = Part.Face(polygon).extrude(App.Vector(0, y_max - y_min, 0))
+        void.Placement = obj.Placement.multiply(void.Placement)
+        return void
+
+    def get_host_void_shape(self, obj, host, in_host_group=True):
+        """Return the opening void shape placed in the host coordinate system.
+
+        If the opening is grouped into the host, the VoidShape is already in
+        the host coordinate system. Otherwise the void is moved according to
+        the opening and host global placements, and cached until their
+        relative placement or the void change.
+        """
+        void = obj.VoidShape
+        if void.isNull():
+            return None
+        if in_host_group:
+            return void
+
+        relative_placement = host.getGlobalPlacement().inverse().multiply(obj.getGlobalPlacement())
+        key = (getattr(self, "void_key", None), tuple(relative_placement.toMatrix().A))
+        if not hasattr(self, "host_voids"):
+            self.host_voids = {}
+        cached = self.host_voids.get(host.Name)
+        if key[0] is not None and cached and cached[0] == key:
+            return cached[1]
+
+        # void placement can be different from opening placement:
+        void.Placement = relative_placement.multiply(obj.Placement.inverse().multiply(void.Placement))
+        self.host_voids[host.Name] = (key, void)
+        return void
+
     def get_rectangular_void(self, obj):
         import Part
         void = Part.makeBox(obj.OpeningWidth.Value, obj.HostThickness.Value + 50, obj.OpeningHeight.Value)
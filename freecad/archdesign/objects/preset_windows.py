@@ -25,7 +25,14 @@
 # \ingroup ARCH
 # \brief Provide the window presets to be used in the Arch Opening object.
 
-from FreeCAD import Vector
+from FreeCAD import Vector, Placement, Rotation
+
+# Preset window shapes already built, keyed on their generating parameters.
+# Every Opening with the same parameters gets a placed reference to the same
+# underlying geometry (TShape) instead of rebuilding it.
+_PRESET_WINDOW_CACHE = {}
+_PRESET_WINDOW_CACHE_SIZE = 256
+
 
 def get_preset_window_shape(obj):
     if not 'FillType' in obj.PropertiesList:
@@ -36,13 +43,8 @@ def get_preset_window_shape(obj):
         return None
 
     if obj.FillType == 'Rectangular':
-        return window_rectangular(obj.HostThickness.Value,
-                                  obj.OpeningHeight.Value + obj.IncreaseHeight.Value,
-                                  obj.OpeningWidth.Value + obj.IncreaseWidth.Value,
-                                  frame_width=obj.FrameWidth.Value,
-                                  frame_th=obj.FrameThickness.Value,
-                                  glass_th=obj.GlassThickness.Value,
-                                  n_pan=obj.NumberOfPanes)
+        key = get_preset_window_key(obj)
+        return get_cached_shape(key, window_rectangular, *key[1:])
 
     elif obj.FillType == 'Elliptical':
         #TODO: add code to draw elliptical window
@@ -53,11 +55,69 @@ def get_preset_window_shape(obj):
         pass
 
 
+def get_preset_window_key(obj):
+    """Return the preset window cache key of the given Opening, that is
+    the FillType followed by the arguments of its shape builder, or None
+    if the opening is not filled with a supported preset window.
+    """
+    if (not 'FillType' in obj.PropertiesList or
+        not 'OpeningWidth' in obj.PropertiesList or
+        not 'OpeningHeight' in obj.PropertiesList):
+        return None
+
+    if obj.FillType == 'Rectangular':
+        return ('Rectangular',
+                obj.HostThickness.Value,
+                obj.OpeningHeight.Value + obj.IncreaseHeight.Value,
+                obj.OpeningWidth.Value + obj.IncreaseWidth.Value,
+                obj.FrameWidth.Value,
+                obj.FrameThickness.Value,
+                obj.GlassThickness.Value,
+                obj.NumberOfPanes,
+                getattr(obj, 'FrameConstruction', 'Members') == 'Single Solid')
+    return None
+
+
+def get_cached_shape(key, builder, *args):
+    """Return a shape built by builder(*args), reusing the cached one if any.
+
+    The returned shape is a new reference to the cached geometry, so its
+    Placement can be changed without affecting the cache or other openings.
+    """
+    shape = _PRESET_WINDOW_CACHE.get(key)
+    if shape is None:
+        shape = builder(*args)
+        if shape is None:
+            return None
+        if len(_PRESET_WINDOW_CACHE) >= _PRESET_WINDOW_CACHE_SIZE:
+            # drop the oldest entry
+            del _PRESET_WINDOW_CACHE[next(iter(_PRESET_WINDOW_CACHE))]
+        _PRESET_WINDOW_CACHE[key] = shape
+    return shape.moved(Placement())
+
+
+def clear_preset_window_cache():
+    """Remove all the cached preset window shapes."""
+    _PRESET_WINDOW_CACHE.clear()
+
+
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 #                                                      PRESET WINDOW PROPERTIES
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
 
+# Sub properties used by every preset window type.
+# All of them are declared once on the Opening object and only the ones
+# of the chosen FillType are shown in the property editor.
+PRESET_WINDOW_SUBPROPERTIES = {
+    'Rectangular': ['NumberOfPanes', 'FrameWidth', 'FrameThickness',
+                    'GlassThickness', 'IncreaseHeight', 'IncreaseWidth',
+                    'FrameConstruction'],
+    'Elliptical': [],
+    'Arc': [],
+}
+
+
 def add_preset_window_properties(obj):
     if not 'FillType' in obj.PropertiesList:
         _tip = 'Preset window types.'
@@ -66,12 +126,31 @@ def add_preset_window_properties(obj):
         obj.FillType = ["Rectangular", "Elliptical", "Arc"]
 
 def add_preset_window_subproperties(obj):
-    if obj.FillType == 'Rectangular':
-        add_preset_window_rectangular_subproperties(obj)
-    if obj.FillType == 'Elliptical':
-        pass
-    if obj.FillType == 'Arc':
-        pass
+    """Declare the sub properties of every preset window type."""
+    add_preset_window_rectangular_subproperties(obj)
+
+def show_preset_window_properties(obj, show=True):
+    """Show in the property editor FillType and the sub properties of the
+    chosen preset window type, and hide all the others.
+    Only properties whose visibility changes are touched.
+    """
+    if not 'FillType' in obj.PropertiesList:
+        return
+    visible = set()
+    if show:
+        visible.add('FillType')
+        visible.update(PRESET_WINDOW_SUBPROPERTIES.get(obj.FillType, []))
+    names = ['FillType']
+    for subproperties in PRESET_WINDOW_SUBPROPERTIES.values():
+        names.extend(subproperties)
+    for name in names:
+        if not name in obj.PropertiesList:
+            continue
+        hidden = 'Hidden' in obj.getEditorMode(name)
+        if name in visible and hidden:
+            obj.setEditorMode(name, 0)
+        elif not name in visible and not hidden:
+            obj.setEditorMode(name, 2)
 
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 #                                                             SHARED COMPONENTS
@@ -80,6 +159,13 @@ def add_preset_window_subproperties(obj):
 def frame_rectangular(tel_w, tel_h , tel_ww, tel_wh, tel_th, et=0):
     """ Return the shape of a rectangular frame.
     """
+    return frame_rectangular_members(tel_w, tel_h , tel_ww, tel_wh, tel_th, et)
+
+
+def frame_rectangular_members(tel_w, tel_h , tel_ww, tel_wh, tel_th, et=0):
+    """ Return the shape of a rectangular frame, as a compound of
+    4 mitred members.
+    """
     import Part
 
     i_tel_w = tel_w - tel_ww * 2
@@ -95,59 +181,58 @@ def frame_rectangular(tel_w, tel_h , tel_ww, tel_wh, tel_th, et=0):
     ip2 = (i_tel_w * 0.5, 0, tel_ww + i_tel_h)
     ip3 = (i_tel_w * -0.5, 0, tel_ww + i_tel_h)
   
-    tel_b = (ep0, ep1, ip1, ip0, ep0)
-    tel_bp = Part.makePolygon([Vector(*vtx) for vtx in tel_b])
-
-    tel_r = (ep1, ep2, ip2, ip1, ep1)
-    tel_rp = Part.makePolygon([Vector(*vtx) for vtx in tel_r])
-
-    tel_t = (ep2, ep3, ip3, ip2, ep2)
-    tel_tp = Part.makePolygon([Vector(*vtx) for vtx in tel_t])
+    # every frame member is a planar mitred face extruded along Y
+    members = []
+    for member in ((ep0, ep1, ip1, ip0, ep0),  # bottom
+                   (ep1, ep2, ip2, ip1, ep1),  # right
+                   (ep2, ep3, ip3, ip2, ep2),  # top
+                   (ep3, ep0, ip0, ip3, ep3)): # left
+        polygon = Part.makePolygon([Vector(*vtx) for vtx in member])
+        members.append(Part.Face(polygon).extrude(Vector(0, tel_th, 0)))
+
+    return Part.makeCompound(members)
+
+
+def frame_rectangular_solid(tel_w, tel_h , tel_ww, tel_wh, tel_th, et=0):
+    """ Return the shape of a rectangular frame, as a single solid
+    extruded from a face with a rectangular hole.
+    It has the same outline of frame_rectangular_members but only
+    10 faces instead of 24.
+    """
+    import Part
 
-    tel_l = (ep3, ep0, ip0, ip3, ep3)
-    tel_lp = Part.makePolygon([Vector(*vtx) for vtx in tel_l])
+    i_tel_w = tel_w - tel_ww * 2
+    i_tel_h = tel_h - tel_wh * 2
 
-    tel_fb = Part.makeFilledFace(tel_bp.Edges) 
-    tel_fbs = tel_fb.extrude(Vector(0, tel_th, 0))
+    outer = ((tel_w * -0.5, 0, 0), (tel_w * 0.5, 0, 0),
+             (tel_w * 0.5, 0, tel_h), (tel_w * -0.5, 0, tel_h))
+    inner = ((i_tel_w * -0.5, 0, tel_ww), (i_tel_w * 0.5, 0, tel_ww),
+             (i_tel_w * 0.5, 0, tel_ww + i_tel_h), (i_tel_w * -0.5, 0, tel_ww + i_tel_h))
 
-    tel_fr = Part.makeFilledFace(tel_rp.Edges) 
-    tel_frs = tel_fr.extrude(Vector(0, tel_th, 0))
-    
-    tel_ft = Part.makeFilledFace(tel_tp.Edges) 
-    tel_fts = tel_ft.extrude(Vector(0, tel_th, 0))
+    wires = [Part.makePolygon([Vector(*vtx) for vtx in outer + outer[:1]]),
+             Part.makePolygon([Vector(*vtx) for vtx in inner + inner[:1]])]
+    face = Part.Face(wires, "Part::FaceMakerBullseye")
 
-    tel_fl = Part.makeFilledFace(tel_lp.Edges) 
-    tel_fls = tel_fl.extrude(Vector(0, tel_th, 0))    
-    
-    return Part.makeCompound([tel_fbs, tel_frs, tel_fts, tel_fls])
+    return face.extrude(Vector(0, tel_th, 0))
 
 
 def glass(ea_w, ea_h, ef_w, ef_h, v_a, frame_th, glass_th): 
     """Return the shape of a rectangular glass panel.
-    TODO: Check if a Part::Box is faster
     """
     import Part
 
     v_w = ea_w - ef_w + v_a * 2
     v_h = ea_h - ef_h + v_a * 2
-    
-    vp0 = (v_w * -0.5, 0, ef_w - v_a)
-    vp1 = (v_w * 0.5, 0, ef_w  - v_a)
-    vp2 = (v_w * 0.5, 0, ef_h - v_a + v_h)
-    vp3 = (v_w * -0.5, 0, ef_h - v_a + v_h)
-    
-    glass_pt = (vp0, vp1, vp2, vp3, vp0)    
-    glass_p = Part.makePolygon([Vector(*vtx) for vtx in glass_pt])
-        
-    glass_f = Part.makeFilledFace(glass_p.Edges) 
-    glass_s = glass_f.extrude(Vector(0, glass_th, 0))
 
-    return glass_s
+    z_min = ef_w - v_a
+    z_max = ef_h - v_a + v_h
+
+    return Part.makeBox(v_w, glass_th, z_max - z_min, Vector(v_w * -0.5, 0, z_min))
 
 
 def default_sill(opening_width, host_thickness, sill_thickness, front_protrusion, lateral_protrusion, inner_covering): 
-    """Return the shape of a rectangular glass panel.
-    TODO: Check if a Part::Box is faster
+    """Return the shape of a default rectangular sill, below the opening
+    and protruding from the front of the host.
     """
     import Part
 
@@ -165,37 +250,58 @@ def default_sill(opening_width, host_thickness, sill_thickness, front_protrusion
 # +++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 
 def add_preset_window_rectangular_subproperties(obj):
-    _tip = 'Number of openable frames. Set 0 for a fixed window.'
-    obj.addProperty('App::PropertyInteger', 'NumberOfPanes', 
-                    'Component - Filling - Options', _tip).NumberOfPanes = 1
+    pl = obj.PropertiesList
+
+    if not 'NumberOfPanes' in pl:
+        _tip = 'Number of openable frames. Set 0 for a fixed window.'
+        obj.addProperty('App::PropertyInteger', 'NumberOfPanes', 
+                        'Component - Filling - Options', _tip).NumberOfPanes = 1
 
-    _tip = 'DESCRIBE.'
-    obj.addProperty('App::PropertyLength', 'FrameWidth', 
-                    'Component - Filling - Options', _tip).FrameWidth = 50.0
+    if not 'FrameWidth' in pl:
+        _tip = 'DESCRIBE.'
+        obj.addProperty('App::PropertyLength', 'FrameWidth', 
+                        'Component - Filling - Options', _tip).FrameWidth = 50.0
 
-    _tip = 'DESCRIBE.'
-    obj.addProperty('App::PropertyLength', 'FrameThickness', 
-                    'Component - Filling - Options', _tip).FrameThickness = 50.0
+    if not 'FrameThickness' in pl:
+        _tip = 'DESCRIBE.'
+        obj.addProperty('App::PropertyLength', 'FrameThickness', 
+                        'Component - Filling - Options', _tip).FrameThickness = 50.0
 
-    _tip = 'DESCRIBE.'
-    obj.addProperty('App::PropertyLength', 'GlassThickness', 
-                    'Component - Filling - Options', _tip).GlassThickness = 20.0
+    if not 'GlassThickness' in pl:
+        _tip = 'DESCRIBE.'
+        obj.addProperty('App::PropertyLength', 'GlassThickness', 
+                        'Component - Filling - Options', _tip).GlassThickness = 20.0
 
-    _tip = 'DESCRIBE.'
-    obj.addProperty('App::PropertyLength', 'IncreaseHeight', 
-                    'Component - Filling - Options', _tip).IncreaseHeight = 0.0
+    if not 'IncreaseHeight' in pl:
+        _tip = 'DESCRIBE.'
+        obj.addProperty('App::PropertyLength', 'IncreaseHeight', 
+                        'Component - Filling - Options', _tip).IncreaseHeight = 0.0
 
-    _tip = 'DESCRIBE.'
-    obj.addProperty('App::PropertyLength', 'IncreaseWidth', 
-                    'Component - Filling - Options', _tip).IncreaseWidth = 0.0
+    if not 'IncreaseWidth' in pl:
+        _tip = 'DESCRIBE.'
+        obj.addProperty('App::PropertyLength', 'IncreaseWidth', 
+                        'Component - Filling - Options', _tip).IncreaseWidth = 0.0
+
+    if not 'FrameConstruction' in pl:
+        _tip = 'Build every frame as 4 mitred members or as a single solid\n'\
+               'with less faces, lighter to cut, display and export.'
+        obj.addProperty('App::PropertyEnumeration', 'FrameConstruction', 
+                        'Component - Filling - Options', _tip).FrameConstruction = ["Members", "Single Solid"]
 
 
 def window_rectangular(opening_th=300, opening_height=1400, opening_width=1200,
-             frame_width=50, frame_th=50, glass_th=21, n_pan=1):
+             frame_width=50, frame_th=50, glass_th=21, n_pan=1, single_solid_frames=False):
     """Return the shape of a full n_panes rectangular window.
+    If single_solid_frames is True, every frame is built as a single solid
+    (see frame_rectangular_solid) instead of 4 mitred members.
     """
     import Part
 
+    if single_solid_frames:
+        make_frame = frame_rectangular_solid
+    else:
+        make_frame = frame_rectangular_members
+
     # permit to differentiate from the top-bottom and left right    
     frame_height = frame_width 
     
@@ -224,7 +330,7 @@ def window_rectangular(opening_th=300, opening_height=1400, opening_width=1200,
     components = []
 
     # CREATE FIXED FRAME
-    components.append(frame_rectangular(opening_width, opening_height, frame_width, 
+    components.append(make_frame(opening_width, opening_height, frame_width, 
                    frame_height, frame_th))
 
     # CREATE OPENING PANELS
@@ -240,7 +346,7 @@ def window_rectangular(opening_th=300, opening_height=1400, opening_width=1200,
         ea_w = res_w
         ea_h = res_h
         
-        open_frame = frame_rectangular(ea_w, ea_h, frame_width,  frame_height, frame_th)
+        open_frame = make_frame(ea_w, ea_h, frame_width,  frame_height, frame_th)
         open_frame.Placement.Base.z = frame_height
         components.append(open_frame)
 
@@ -251,31 +357,24 @@ def window_rectangular(opening_th=300, opening_height=1400, opening_width=1200,
 
     elif n_pan > 1 and n_pan < 10: 
         # Create a multi pane window
+        # every pane is identical: build the first one and place
+        # references to its geometry for the others
         fact_w = res_w / n_pan
-        
-        loop = True
-        cnt = 1
-        while loop is True:
-            if cnt > n_pan:
-                break
-            ea_w = fact_w
-            adv_x = (cnt - 1) * fact_w
-            ofx = (res_w * -0.5) + fact_w * 0.5 + adv_x
-            ea_h = res_h
+        ea_w = fact_w
+        ea_h = res_h
 
-            open_frame = frame_rectangular(ea_w, ea_h, frame_width,  frame_height, frame_th)
-            open_frame.Placement.Base.x = ofx
-            open_frame.Placement.Base.z = frame_height
-        
-            components.append(open_frame)        
-        
-            glass_s = glass(ea_w, ea_h, ef_w, ef_h, v_a, frame_th, glass_th)  
-            glass_s.Placement.Base.x = ofx
-            glass_s.Placement.Base.y = (frame_th - glass_th) * 0.5
+        open_frame = make_frame(ea_w, ea_h, frame_width,  frame_height, frame_th)
+        open_frame.Placement.Base.z = frame_height
+
+        glass_s = glass(ea_w, ea_h, ef_w, ef_h, v_a, frame_th, glass_th)  
+        glass_s.Placement.Base.y = (frame_th - glass_th) * 0.5
 
-            components.append(glass_s)
+        pane = Part.makeCompound([open_frame, glass_s])
 
-            cnt += 1
+        for cnt in range(n_pan):
+            adv_x = cnt * fact_w
+            ofx = (res_w * -0.5) + fact_w * 0.5 + adv_x
+            components.append(pane.moved(Placement(Vector(ofx, 0, 0), Rotation())))
 
     window = Part.makeCompound(components)
  
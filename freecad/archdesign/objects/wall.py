@@ -33,6 +33,8 @@ import draftutils.utils as utils
 
 from freecad.archdesign.objects.base import Component
 
+import freecad.archdesign.objects.preset_windows as window_presets
+
 if App.GuiUp:
     import FreeCADGui as Gui
     from PySide import QtCore, QtGui
@@ -133,6 +135,47 @@ class Wall(Component):
                             'Level properties', 
                             _tip).TopOffset = '0'
 
+        # QUANTITIES Properties (read only) ---------------------------------
+        if not 'GrossArea' in existing_properties:
+            _tip = 'Side area of the wall, measured along the core axis,\n'\
+                   'without subtracting the openings.'
+            obj.addProperty('App::PropertyArea', 'GrossArea',
+                            'Quantities', _tip, 1)
+
+        if not 'NetArea' in existing_properties:
+            _tip = 'Side area of the wall, measured along the core axis,\n'\
+                   'minus the area of the hosted openings.'
+            obj.addProperty('App::PropertyArea', 'NetArea',
+                            'Quantities', _tip, 1)
+
+        if not 'OpeningArea' in existing_properties:
+            _tip = 'Sum of the areas of the hosted openings.'
+            obj.addProperty('App::PropertyArea', 'OpeningArea',
+                            'Quantities', _tip, 1)
+
+        if not 'GrossVolume' in existing_properties:
+            _tip = 'Volume of the wall without subtracting the openings.'
+            obj.addProperty('App::PropertyVolume', 'GrossVolume',
+                            'Quantities', _tip, 1)
+
+        if not 'NetVolume' in existing_properties:
+            _tip = 'Volume of the wall minus the volume of the hosted openings.'
+            obj.addProperty('App::PropertyVolume', 'NetVolume',
+                            'Quantities', _tip, 1)
+
+        if not 'LayerVolumes' in existing_properties:
+            _tip = 'Net volume of each MultiMaterial layer of the wall (mm^3),\n'\
+                   'listed in the same order of the material thicknesses.'
+            obj.addProperty('App::PropertyFloatList', 'LayerVolumes',
+                            'Quantities', _tip, 1)
+
+        if not 'AnalyticQuantities' in existing_properties:
+            _tip = 'True if all the quantities are computed from the wall parameters.\n'\
+                   'If False, GrossVolume and NetVolume are measured on the wall shape\n'\
+                   'and the other quantities are not computed.'
+            obj.addProperty('App::PropertyBool', 'AnalyticQuantities',
+                            'Quantities', _tip, 1)
+
         # WALL CONNECTIONS Properties ---------------------------------------
         if not 'JoinFirstEnd' in existing_properties:
             _tip = "Allow automatic compute of first end"
@@ -244,10 +287,7 @@ class Wall(Component):
             for t_name in obj.IncomingTJoins:
                 t = App.ActiveDocument.getObject(t_name)
                 t.Proxy.recompute_ends(t)
-            for opening in obj.Openings:
-                if not hasattr(opening, "HostThickness"):
-                    continue
-                opening.HostThickness = obj.Width
+            self.propagate_host_thickness(obj)
 
         # WALL JOIN ENDS properties
         if (hasattr(obj, "JoinFirstEndTo") and hasattr(obj, "JoinLastEndTo") and
@@ -328,49 +368,65 @@ class Wall(Component):
                 # TODO: Is it better to fuse the additions instead of grouping them with a compound?
                 wall_shape = Part.makeCompound(shape_collection)
 
+        # index the wall children by name once, so membership checks
+        # do not scan the Group list for every component
+        group_names = set(o.Name for o in obj.Group)
+        inverse_wall_placement = None
+
         # subtract Subtractions
+        cut_shapes = []
         if hasattr(obj, "Subtractions") and obj.Subtractions:
             for o in obj.Subtractions:
-                cut_shape = None
-                if o in obj.Group and hasattr(o, "Shape"):
+                if not hasattr(o, "Shape"):
+                    continue
+                if o.Name in group_names:
                     # subtraction object is inside the wall
                     relative_placement = o.Placement
                     if hasattr(o, "InList") and o.InList[0] != obj:
                         # don't remember why this is necessary...
                         relative_placement = o.InList[0].Placement.multiply(o.Placement)
-                    cut_shape = o.Shape.copy()
-                    cut_shape.Placement = relative_placement
-                elif hasattr(o, "Shape"):
+                else:
                     # subtraction object is not inside the wall, compute it's correct relative placement
-                    global_placement = o.getGlobalPlacement()
-                    relative_placement = obj.getGlobalPlacement().inverse().multiply(global_placement)
-                    cut_shape = o.Shape.copy()
-                    cut_shape.Placement = relative_placement
-
-                if cut_shape is not None:
-                    wall_shape = wall_shape.cut(cut_shape)
+                    if inverse_wall_placement is None:
+                        inverse_wall_placement = obj.getGlobalPlacement().inverse()
+                    relative_placement = inverse_wall_placement.multiply(o.getGlobalPlacement())
+                cut_shape = o.Shape.copy()
+                cut_shape.Placement = relative_placement
+                cut_shapes.append(cut_shape)
 
         if hasattr(obj, "Openings") and obj.Openings:
             # objects marked as Openings must be appropriate Opening objects to cut the wall
             # TODO: Add a flag to also subtract window positive shapes from wall
             for o in obj.Openings:
                 # cut opening void
-                void = None
-                if o in obj.Group and hasattr(o, "VoidShape"):
-                    void = o.VoidShape.copy()
-                elif hasattr(o, "VoidShape"):
+                if hasattr(o, "Proxy") and hasattr(o.Proxy, "get_host_void_shape"):
+                    # the opening provides its void already placed in the wall frame
+                    void = o.Proxy.get_host_void_shape(o, obj, o.Name in group_names)
+                    if void is not None:
+                        cut_shapes.append(void)
+                    continue
+                if not hasattr(o, "VoidShape") or o.VoidShape.isNull():
+                    continue
+                void = o.VoidShape.copy()
+                if not o.Name in group_names:
                     # opening object is not inside the wall, compute it's correct relative placement
-                    global_placement = o.getGlobalPlacement()
-                    relative_placement = obj.getGlobalPlacement().inverse().multiply(global_placement)
-                    void = o.VoidShape.copy()
+                    if inverse_wall_placement is None:
+                        inverse_wall_placement = obj.getGlobalPlacement().inverse()
+                    relative_placement = inverse_wall_placement.multiply(o.getGlobalPlacement())
                     # void placement can be different from opening placement:
                     void.Placement = relative_placement.multiply(o.Placement.inverse().multiply(void.Placement))
+                cut_shapes.append(void)
 
-                if void is not None:
-                    wall_shape = wall_shape.cut(void)
+        gross_shape = wall_shape
+        if cut_shapes:
+            # cut all the subtractions and the opening voids in a single
+            # boolean operation instead of one cut per component
+            wall_shape = wall_shape.cut(cut_shapes)
 
         obj.Shape = wall_shape
 
+        self.update_quantities(obj, gross_shape)
+
 
     # Wall default shape methods +++++++++++++++++++++++++++++++++++++++++++++++
 
@@ -393,8 +449,67 @@ class Wall(Component):
                     <--> first_splay                <--> last_splay
         """
         import Part
-        import Draft
 
+        parameters = self.get_default_shape_parameters(obj)
+        if parameters is None:
+            return
+        first_point, thickness, inner_params, outer_params = parameters
+
+        Xmin, X2min, Xmax, X2max = inner_params
+        inner_half = Part.makeWedge( Xmin, 0, 0, 0, X2min,
+                                        Xmax, thickness/2, obj.Height, obj.Height, X2max)#, obj.AxisFirstPointX, obj.AxisLastPointX )
+        inner_half.Placement.Base.x = first_point
+
+        Xmin, X2min, Xmax, X2max = outer_params
+        outer_half = Part.makeWedge( Xmin, 0, 0, 0, X2min,
+                                        Xmax, thickness/2, obj.Height, obj.Height, X2max)#, obj.Start, obj.End)
+                
+        outer_half.Placement.Base = App.Vector(first_point, - thickness/2)
+        
+        mono_layer = inner_half.fuse(outer_half)
+
+        mono_layer = mono_layer.removeSplitter()
+        
+        # split according to material layers
+
+        if hasattr(obj, "Material") and obj.Material and utils.get_type(obj.Material) == 'MultiMaterial':
+            pass
+        else:
+            return mono_layer
+
+        layer_thicknesses = obj.Material.Thicknesses
+
+        slicing_plane = Part.makePlane(500000.0, 500000.0, App.Vector(-250000.0, -250000.0, 0.0))
+        slicing_plane.rotate(App.Vector(0 ,0 , 0), App.Vector(1, 0, 0), 90.0)
+
+        slicing_planes = []
+        offset = 0.0
+        for lt in layer_thicknesses[:-1]:
+            offset += lt
+            plane = slicing_plane.copy()
+            plane.translate(App.Vector(0, offset-thickness.Value/2, 0))
+            slicing_planes.append(plane)
+
+        compound = mono_layer.generalFuse(slicing_planes)[0] # generalFuse output also a list of list of shape (map)
+
+        for shape in compound.SubShapes:
+            if shape.ShapeType == "Compound":
+                return shape
+
+
+    def get_default_shape_parameters(self, obj):
+        """
+        Return the parameters of the 2 Part Wedge solids that define the
+        wall default base shape, as a tuple:
+            (first_point, thickness, inner_half, outer_half)
+        where inner_half and outer_half are (Xmin, X2min, Xmax, X2max) tuples:
+        the X extents of the wedge on the side lying on Y=0 of its own
+        coordinate system and on the side lying on Y=thickness/2.
+        The outer half is then placed at Y=-thickness/2.
+
+        Return None if the wall has not enough data to build its default shape.
+        """
+        import Draft
 
         if not hasattr(obj,"AxisFirstPointX") or not hasattr(obj,"AxisLastPointX") \
             or not hasattr(obj,"Width") or not hasattr(obj,"Height"):
@@ -423,14 +538,8 @@ class Wall(Component):
         last_splay = thickness/2 * math.tan(math.pi/2-math.radians(obj.LastCoreInnerAngle))
         
         Xmin = -obj.FirstCoreOffset
-        Ymin = 0
-        Zmin = 0
-        Z2min = 0
         X2min = first_splay - obj.FirstCoreOffset
         Xmax = length + obj.LastCoreOffset
-        Ymax = thickness/2
-        Zmax = obj.Height
-        Z2max = obj.Height
         X2max = length - last_splay + obj.LastCoreOffset
 
         # checking conditions that will break Part.makeWedge()
@@ -445,22 +554,14 @@ class Wall(Component):
             X2min = 0
             X2max = length
 
-        inner_half = Part.makeWedge( Xmin, Ymin, Zmin, Z2min, X2min,
-                                        Xmax, Ymax, Zmax, Z2max, X2max)#, obj.AxisFirstPointX, obj.AxisLastPointX )
-        inner_half.Placement.Base.x = first_point
+        inner_half = (Xmin, X2min, Xmax, X2max)
 
         first_splay = thickness/2 * math.tan(math.pi/2-math.radians(obj.FirstCoreOuterAngle))
         last_splay = thickness/2 * math.tan(math.pi/2-math.radians(obj.LastCoreOuterAngle))          
         
         Xmin = first_splay - obj.FirstCoreOffset
-        Ymin = 0
-        Zmin = 0
-        Z2min = 0
         X2min = -obj.FirstCoreOffset
         Xmax = length - last_splay + obj.LastCoreOffset
-        Ymax = thickness/2
-        Zmax = obj.Height
-        Z2max = obj.Height
         X2max = length + obj.LastCoreOffset
 
         # checking conditions that will break Part.makeWedge()
@@ -475,40 +576,176 @@ class Wall(Component):
             Xmin = 0
             Xmax = length
 
-        outer_half = Part.makeWedge( Xmin, Ymin, Zmin, Z2min, X2min,
-                                        Xmax, Ymax, Zmax, Z2max, X2max)#, obj.Start, obj.End)
-                
-        outer_half.Placement.Base = App.Vector(first_point, - thickness/2)
-        
-        mono_layer = inner_half.fuse(outer_half)
+        outer_half = (Xmin, X2min, Xmax, X2max)
 
-        mono_layer = mono_layer.removeSplitter()
-        
-        # split according to material layers
+        return first_point, thickness, inner_half, outer_half
 
-        if hasattr(obj, "Material") and obj.Material and utils.get_type(obj.Material) == 'MultiMaterial':
-            pass
-        else:
-            return mono_layer
 
-        layer_thicknesses = obj.Material.Thicknesses
+    # Wall quantities methods ++++++++++++++++++++++++++++++++++++++++++++++++
 
-        slicing_plane = Part.makePlane(500000.0, 500000.0, App.Vector(-250000.0, -250000.0, 0.0))
-        slicing_plane.rotate(App.Vector(0 ,0 , 0), App.Vector(1, 0, 0), 90.0)
+    def update_quantities(self, obj, gross_shape=None):
+        """
+        Update the wall Quantities properties, computing them analytically
+        from the default shape parameters and the hosted openings sizes,
+        without querying the OCC shape mass properties.
+
+        Quantities are recomputed only when their input values changed since
+        the last update.
+        If the "WallQuantitiesCheck" Arch preference is set, the result is
+        compared with the OCC volume of the wall shape.
+
+        Walls that cannot be computed analytically (see compute_quantities)
+        get GrossVolume and NetVolume from the OCC volumes of the given
+        gross_shape, the wall shape before the cuts, and of the wall shape.
+        Their other quantities are left untouched and AnalyticQuantities
+        is set to False.
+        """
+        if not hasattr(obj, "LayerVolumes"):
+            # object created before the quantities were introduced
+            return
 
-        slicing_planes = []
-        offset = 0.0
-        for lt in layer_thicknesses[:-1]:
-            offset += lt
-            plane = slicing_plane.copy()
-            plane.translate(App.Vector(0, offset-thickness.Value/2, 0))
-            slicing_planes.append(plane)
+        quantities = None
+        if not obj.BaseGeometry and not obj.Additions and not obj.Subtractions:
+            key = self.get_quantities_key(obj)
+            if key == getattr(self, "quantities_key", None):
+                return
+            quantities = self.compute_quantities(obj)
+        analytic = quantities is not None
+        # the key does not cover the shapes the fallback is measured on
+        self.quantities_key = key if analytic else None
+        if hasattr(obj, "AnalyticQuantities") and obj.AnalyticQuantities != analytic:
+            obj.AnalyticQuantities = analytic
+
+        if not analytic:
+            # walls based on BaseGeometry, with Additions or Subtractions,
+            # or with openings that are not full depth rectangles
+            if gross_shape is not None and not gross_shape.isNull():
+                obj.GrossVolume = gross_shape.Volume
+            if not obj.Shape.isNull():
+                obj.NetVolume = obj.Shape.Volume
+            return
 
-        compound = mono_layer.generalFuse(slicing_planes)[0] # generalFuse output also a list of list of shape (map)
+        gross_area, net_area, opening_area, gross_volume, net_volume, layer_volumes = quantities
+        obj.GrossArea = gross_area
+        obj.NetArea = net_area
+        obj.OpeningArea = opening_area
+        obj.GrossVolume = gross_volume
+        obj.NetVolume = net_volume
+        obj.LayerVolumes = layer_volumes
 
-        for shape in compound.SubShapes:
-            if shape.ShapeType == "Compound":
-                return shape
+        p = App.ParamGet("User parameter:BaseApp/Preferences/Mod/Arch")
+        if p.GetBool("WallQuantitiesCheck", False):
+            self.check_quantities(obj)
+
+
+    def get_quantities_key(self, obj):
+        """
+        Return a tuple of all the values the wall quantities depend on.
+        """
+        thicknesses = ()
+        if obj.Material and utils.get_type(obj.Material) == 'MultiMaterial':
+            thicknesses = tuple(obj.Material.Thicknesses)
+        openings = tuple((o.OpeningWidth.Value, o.OpeningHeight.Value,
+                          getattr(o, "Void", None), getattr(o, "VoidSubtractAll", False))
+                         for o in obj.Openings
+                         if hasattr(o, "OpeningWidth") and hasattr(o, "OpeningHeight"))
+        return (obj.AxisFirstPointX.Value, obj.AxisLastPointX.Value,
+                obj.Width.Value, obj.Height.Value,
+                obj.FirstCoreInnerAngle.Value, obj.FirstCoreOuterAngle.Value,
+                obj.LastCoreInnerAngle.Value, obj.LastCoreOuterAngle.Value,
+                obj.FirstCoreOffset.Value, obj.LastCoreOffset.Value,
+                thicknesses, openings, len(obj.BaseGeometry),
+                len(obj.Additions), len(obj.Subtractions))
+
+
+    def compute_quantities(self, obj):
+        """
+        Compute the wall quantities from its default shape parameters.
+
+        Every wedge of the default shape is a prism with a trapezoidal
+        footprint, so the wall length varies linearly across the thickness
+        and every volume is the integral of that length times the height.
+
+        Openings are assumed to be full depth rectangles: voids of
+        OpeningWidth x OpeningHeight crossing the whole wall thickness and
+        lying within the wall. Openings whose Void is not Rectangular, or
+        with VoidSubtractAll set, make the quantities not computable.
+        Openings overlapping each other or the wall boundary give wrong
+        quantities: set the "WallQuantitiesCheck" preference to be warned.
+
+        Returns
+        -------
+        tuple
+            (gross_area, net_area, opening_area, gross_volume, net_volume,
+            layer_volumes) or None if the quantities cannot be computed.
+        """
+        for o in obj.Openings:
+            if not hasattr(o, "OpeningWidth") or not hasattr(o, "OpeningHeight"):
+                continue
+            if getattr(o, "Void", "Rectangular") != "Rectangular" or getattr(o, "VoidSubtractAll", False):
+                return None
+
+        parameters = self.get_default_shape_parameters(obj)
+        if parameters is None:
+            return None
+        first_point, thickness, inner_params, outer_params = parameters
+        thickness = float(thickness)
+        height = obj.Height.Value
+
+        # (Y of the wedge side lying on its own Y=0, length of that side,
+        #  length of the side lying on its own Y=thickness/2)
+        halves = []
+        for y0, params in ((0.0, inner_params), (-thickness/2, outer_params)):
+            Xmin, X2min, Xmax, X2max = [float(v) for v in params]
+            halves.append((y0, Xmax - Xmin, X2max - X2min))
+
+        def footprint_area(y_start, y_end):
+            """Area of the wall footprint between the given Y coordinates."""
+            area = 0.0
+            for y0, l0, l1 in halves:
+                a = max(y_start, y0)
+                b = min(y_end, y0 + thickness/2)
+                if b <= a:
+                    continue
+                la = l0 + (l1 - l0) * (a - y0) / (thickness/2)
+                lb = l0 + (l1 - l0) * (b - y0) / (thickness/2)
+                area += (b - a) * (la + lb) / 2
+            return area
+
+        core_length = halves[0][1]
+        gross_area = core_length * height
+        opening_area = 0.0
+        for o in obj.Openings:
+            if hasattr(o, "OpeningWidth") and hasattr(o, "OpeningHeight"):
+                opening_area += o.OpeningWidth.Value * o.OpeningHeight.Value
+
+        gross_volume = footprint_area(-thickness/2, thickness/2) * height
+        net_volume = gross_volume - opening_area * thickness
+
+        layer_volumes = []
+        if obj.Material and utils.get_type(obj.Material) == 'MultiMaterial':
+            y = -thickness/2
+            for lt in obj.Material.Thicknesses:
+                layer_volume = footprint_area(y, y + lt) * height - opening_area * lt
+                layer_volumes.append(layer_volume)
+                y += lt
+
+        return (gross_area, gross_area - opening_area, opening_area,
+                gross_volume, net_volume, layer_volumes)
+
+
+    def check_quantities(self, obj):
+        """
+        Compare the analytic NetVolume with the OCC volume of the wall shape
+        and print a warning if they differ.
+        """
+        if obj.Shape.isNull() or not obj.Shape.isValid():
+            return
+        occ_volume = obj.Shape.Volume
+        if abs(occ_volume - obj.NetVolume.Value) > max(1.0, occ_volume * 1e-6):
+            App.Console.PrintWarning("Wall " + obj.Label + ": analytic volume "
+                                     + str(obj.NetVolume.Value) + " differs from shape volume "
+                                     + str(occ_volume) + "\n")
 
 
     # Wall default shape joining methods ++++++++++++++++++++++++++++++++++++++++
@@ -893,29 +1130,32 @@ class Wall(Component):
         Understand if object was added or removed from wall, and performs 
         consequent operations.
         """
+        added_objs = []
+        removed_objs = []
         if hasattr(self, "oldGroup"):
             # understand if the object was added or removed
-            added_objs = [x for x in obj.Group if x not in self.oldGroup]
-            removed_objs = [x for x in self.oldGroup if x not in obj.Group]
+            # comparing object names sets, to keep it linear on big groups
+            old_names = set(o.Name for o in self.oldGroup)
+            new_names = set(o.Name for o in obj.Group)
+            added_objs = [x for x in obj.Group if x.Name not in old_names]
+            removed_objs = [x for x in self.oldGroup if x.Name not in new_names]
             del self.oldGroup
-        for o in removed_objs:
-            # if it was removed, remove it from wall children linking
-            print("Removing " + o.Label + " from " + obj.Label)
-            if o in obj.BaseGeometry:
-                BaseGeometry = obj.BaseGeometry
-                BaseGeometry.remove(o)
-                obj.BaseGeometry = BaseGeometry
-
-            elif o in obj.Subtractions:
-                Subtractions = obj.Subtractions
-                Subtractions.remove(o)
-                obj.Subtractions = Subtractions
-
-            elif o in obj.Openings:
-                Openings = obj.Openings
-                Openings.remove(o)
-                obj.Openings = Openings
 
+        if removed_objs:
+            # if it was removed, remove it from wall children linking
+            # every link list property is written only once
+            removed_names = set()
+            for o in removed_objs:
+                print("Removing " + o.Label + " from " + obj.Label)
+                removed_names.add(o.Name)
+            for prop in ("BaseGeometry", "Subtractions", "Openings"):
+                links = getattr(obj, prop)
+                kept_links = [link for link in links if link.Name not in removed_names]
+                if len(kept_links) != len(links):
+                    setattr(obj, prop, kept_links)
+
+        added_openings = []
+        subtraction_names = set(o.Name for o in obj.Subtractions)
         for o in added_objs:
             # if it was added, check if it is an opening or ask if it has to be treated as a 
             print("Adding " + o.Name + " to " + obj.Label)
@@ -924,13 +1164,16 @@ class Wall(Component):
 
             if hasattr(o, "IfcType"):
                 if o.IfcType == 'Opening Element':
-                    self.add_opening(obj, o)
+                    added_openings.append(o)
                     continue
 
-            if not o in obj.Subtractions: # subtracting objects can be wherever in the document
+            if not o.Name in subtraction_names: # subtracting objects can be wherever in the document
                 print("added a new object to the wall")
                 self.add_as_base_shape(obj, o)
 
+        if added_openings:
+            self.add_openings(obj, added_openings)
+
 
     def add_opening(self, obj, child):
         """
@@ -940,11 +1183,53 @@ class Wall(Component):
         TODO: check if the opening is a proper FreeCAD Opening object, else
               add it to subtractions
         """
+        self.add_openings(obj, [child])
+
+
+    def add_openings(self, obj, children):
+        """
+        Append the given opening objects to the wall Openings property,
+        skipping the ones already there, with a single property write.
+        """
         openings = obj.Openings
-        openings.append(child)
+        opening_names = set(o.Name for o in openings)
+        for child in children:
+            if child.Name in opening_names:
+                continue
+            openings.append(child)
+            opening_names.add(child.Name)
         obj.Openings = openings
 
 
+    def propagate_host_thickness(self, obj):
+        """
+        Set the wall Width as HostThickness of all the hosted openings in
+        one batch, touching only the openings whose value actually changes.
+
+        The preset window fill of every distinct (fill parameters,
+        thickness) key is then built once into the preset window cache
+        (see preset_windows.get_preset_window_key), so the openings
+        executes only take placed references to it. Nothing is recomputed
+        here: the next document recompute executes the touched openings
+        and then the wall, which depends on them, once.
+        """
+        width = obj.Width.Value
+        openings = [o for o in obj.Openings
+                    if hasattr(o, "HostThickness") and o.HostThickness.Value != width]
+        for opening in openings:
+            opening.HostThickness = width
+
+        fill_keys = set()
+        for opening in openings:
+            if getattr(opening, "Fill", None) != "Preset Window":
+                continue
+            key = window_presets.get_preset_window_key(opening)
+            if key is None or key in fill_keys:
+                continue
+            fill_keys.add(key)
+            window_presets.get_preset_window_shape(opening)
+
+
     def add_as_base_shape(self, obj, child):
         """
         This method is called when a new object is added to the wall.
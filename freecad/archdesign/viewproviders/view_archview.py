@@ -109,8 +109,14 @@ class ViewProviderArchView(object):
     def updateData(self, obj, prop):
         """This method is called when an Object property changes."""
         if prop in ["Placement"]:
-            self.onChanged(obj.ViewObject,"DisplayLength")
-            self.onChanged(obj.ViewObject,"CutView")
+            # the marker is drawn in the object coordinate system, only the
+            # clipping plane follows the placement: update it once when the
+            # GUI gets idle, so a burst of placement changes costs one setup
+            if getattr(self, "placement_timer", None) is None:
+                self.placement_timer = QtCore.QTimer()
+                self.placement_timer.setSingleShot(True)
+                self.placement_timer.timeout.connect(lambda: self.onChanged(obj.ViewObject,"CutView"))
+            self.placement_timer.start(0)
 
 
     def onChanged(self, vobj, prop):